@@ -0,0 +1,58 @@
+# analysis/keyword_sentiment.py
+import codecs
+import re
+
+TRAILING_WORD = re.compile(r"\w*\Z")
+
+class KeywordSentimentScorer:
+    """Counts positive and negative keywords in one pass with a precompiled
+    whole-word pattern, either over a string or over streamed chunks."""
+
+    def __init__(self, positive_words, negative_words):
+        self._polarity = {word.lower(): 1 for word in positive_words}
+        self._polarity.update({word.lower(): -1 for word in negative_words})
+        words = sorted(self._polarity, key=len, reverse=True)
+        self._pattern = re.compile(r"\b(" + "|".join(map(re.escape, words)) + r")\b", re.IGNORECASE)
+        self._max_word_length = len(words[0]) if words else 0
+
+    def count(self, text):
+        positive = negative = 0
+        for match in self._pattern.finditer(text):
+            if self._polarity[match.group(1).lower()] > 0:
+                positive += 1
+            else:
+                negative += 1
+        return positive, negative
+
+    def count_stream(self, chunks):
+        """Count over an iterable of str or bytes chunks without joining them."""
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        positive = negative = 0
+        carry = ""
+
+        for chunk in chunks:
+            if isinstance(chunk, bytes):
+                chunk = decoder.decode(chunk)
+            text = carry + chunk
+
+            # Hold back a trailing partial word; it may continue in the next chunk.
+            # Anything longer than the longest keyword can never match, so only
+            # that much needs to be kept.
+            tail_start = TRAILING_WORD.search(text).start()
+            carry = text[tail_start:][-(self._max_word_length + 1):]
+            chunk_positive, chunk_negative = self.count(text[:tail_start])
+            positive += chunk_positive
+            negative += chunk_negative
+
+        text = carry + decoder.decode(b"", final=True)
+        chunk_positive, chunk_negative = self.count(text)
+        return positive + chunk_positive, negative + chunk_negative
+
+    @staticmethod
+    def label(positive_count, negative_count):
+        if positive_count > negative_count * 1.5:
+            return "Positive"
+        elif negative_count > positive_count * 1.5:
+            return "Negative"
+        else:
+            return "Neutral"
@@ -0,0 +1,72 @@
+# analysis/phrase_matcher.py
+import re
+from collections import deque
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:['-][a-z0-9]+)*")
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+class PhraseMatcher:
+    """Aho-Corasick automaton over word tokens.
+
+    Finds every occurrence of every phrase in a single left-to-right pass, so
+    matching cost depends on the text length, not on how many phrases are loaded.
+    """
+
+    def __init__(self, phrases):
+        # Node 0 is the root; each node has token transitions, a failure link and
+        # the (phrase, score) pairs that end there.
+        self._transitions = [{}]
+        self._failure = [0]
+        self._outputs = [[]]
+        self._size = 0
+
+        for phrase, score in phrases.items():
+            self._add(phrase, score)
+        self._build_failure_links()
+
+    def _add(self, phrase, score):
+        node = 0
+        for token in tokenize(phrase):
+            next_node = self._transitions[node].get(token)
+            if next_node is None:
+                next_node = len(self._transitions)
+                self._transitions.append({})
+                self._failure.append(0)
+                self._outputs.append([])
+                self._transitions[node][token] = next_node
+            node = next_node
+        if node:
+            self._outputs[node].append((phrase, score))
+            self._size += 1
+
+    def _build_failure_links(self):
+        queue = deque(self._transitions[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._transitions[node].items():
+                fallback = self._failure[node]
+                while fallback and token not in self._transitions[fallback]:
+                    fallback = self._failure[fallback]
+                target = self._transitions[fallback].get(token, 0)
+                self._failure[child] = target if target != child else 0
+                self._outputs[child] = self._outputs[child] + self._outputs[self._failure[child]]
+                queue.append(child)
+
+    def find(self, text):
+        matches = []
+        node = 0
+        for token in tokenize(text):
+            while node and token not in self._transitions[node]:
+                node = self._failure[node]
+            node = self._transitions[node].get(token, 0)
+            matches.extend(self._outputs[node])
+        return matches
+
+    def score(self, text):
+        return sum(score for _, score in self.find(text))
+
+    def __len__(self):
+        # Outputs also hold phrases inherited through failure links.
+        return self._size
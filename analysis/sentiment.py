@@ -1,66 +1,208 @@
-from textblob import TextBlob
-import nltk
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+from config import (SENTIMENT_CACHE_SIZE, SENTIMENT_PROCESSES, SENTIMENT_PROCESS_THRESHOLD,
+                    SENTIMENT_LEXICON_PATH)
+from analysis.phrase_matcher import PhraseMatcher
+import hashlib
+import json
+import math
+import os
+import threading
 import re
 
-try:
-    nltk.data.find('vader_lexicon')
-except LookupError:
-    nltk.download('vader_lexicon')
+# Normalization constant VADER uses to map a raw valence sum into [-1, 1].
+VADER_ALPHA = 15
+MAX_COMPOUND = 0.9999
+
+# Financial terms VADER does not know or under-weights.
+FINANCIAL_LEXICON = {
+    "beat expectations": 3.0,
+    "exceeded expectations": 3.0,
+    "missed expectations": -3.0,
+    "fell short": -2.5,
+    "earnings beat": 2.5,
+    "earnings miss": -2.5,
+    "guidance raised": 3.0,
+    "guidance lowered": -3.0,
+    "downgrade": -2.0,
+    "upgrade": 2.0,
+    "bullish": 2.0,
+    "bearish": -2.0,
+    "rally": 2.0,
+    "sell-off": -2.0,
+    "recession": -2.5,
+    "growth": 1.5,
+    "profit": 1.5,
+    "loss": -1.5,
+    "bankruptcy": -4.0,
+    "acquisition": 1.5,
+    "merger": 1.5,
+    "lawsuit": -1.5,
+    "investigation": -2.0,
+    "fine": -2.0,
+    "penalty": -2.0,
+    "regulatory approval": 2.0,
+    "fda approval": 3.0,
+    "clinical trial success": 3.0,
+    "clinical trial failure": -3.0,
+    "patent": 1.5,
+    "innovation": 2.0,
+    "layoffs": -2.0,
+    "job cuts": -2.0,
+    "restructuring": -1.0,
+    "debt": -1.0,
+    "default": -3.0,
+    "dividend increase": 2.0,
+    "dividend cut": -2.0,
+    "stock buyback": 1.5,
+    "overvalued": -1.5,
+    "undervalued": 1.5,
+}
+
+def load_vader_analyzer(lexicon_path=SENTIMENT_LEXICON_PATH):
+    """VADER analyzer built from the bundled lexicon artifact.
+
+    nltk is imported here rather than at module level, and nothing is
+    downloaded: without the artifact NLTK's own vader_lexicon data must be
+    installed. Rebuild the artifact with scripts/build_sentiment_lexicon.py.
+    """
+    from nltk.sentiment.vader import SentimentIntensityAnalyzer, VaderConstants
+
+    if not os.path.exists(lexicon_path):
+        print(f"Sentiment lexicon {lexicon_path} not found, loading NLTK's vader_lexicon")
+        return SentimentIntensityAnalyzer()
+
+    class PrebuiltSentimentIntensityAnalyzer(SentimentIntensityAnalyzer):
+        # Skips the text lexicon parse in SentimentIntensityAnalyzer.__init__.
+        def __init__(self, lexicon):
+            self.lexicon_file = None
+            self.lexicon = lexicon
+            self.constants = VaderConstants()
+
+    with open(lexicon_path, encoding='utf-8') as f:
+        return PrebuiltSentimentIntensityAnalyzer(json.load(f)['lexicon'])
+
+class SentimentScoreCache:
+    """Bounded LRU of VADER compound scores keyed by a hash of the scored text."""
+
+    def __init__(self, max_entries=SENTIMENT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._scores = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(text):
+        return hashlib.sha1(text.encode('utf-8')).digest()
+
+    def get(self, key):
+        with self._lock:
+            score = self._scores.get(key)
+            if score is not None:
+                self._scores.move_to_end(key)
+            return score
+
+    def put(self, key, score):
+        with self._lock:
+            self._scores[key] = score
+            self._scores.move_to_end(key)
+            while len(self._scores) > self.max_entries:
+                self._scores.popitem(last=False)
+
+    def __len__(self):
+        return len(self._scores)
+
+
+_score_cache = SentimentScoreCache()
+_process_pool = None
+_process_pool_lock = threading.Lock()
+_worker_analyzer = None
+
+def _get_process_pool(processes):
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=processes, initializer=_init_scoring_worker)
+        return _process_pool
+
+def _init_scoring_worker():
+    global _worker_analyzer
+    _worker_analyzer = SentimentAnalyzer()
+
+def _score_in_worker(texts):
+    return [_worker_analyzer._compound_score(text) for text in texts]
 
 class SentimentAnalyzer:
     def __init__(self):
-        self.vader = SentimentIntensityAnalyzer()
+        self.vader = load_vader_analyzer()
         self._add_financial_terms()
     
     def _add_financial_terms(self):
-        financial_lexicon = {
-            "beat expectations": 3.0,
-            "exceeded expectations": 3.0,
-            "missed expectations": -3.0,
-            "fell short": -2.5,
-            "earnings beat": 2.5,
-            "earnings miss": -2.5,
-            "guidance raised": 3.0,
-            "guidance lowered": -3.0,
-            "downgrade": -2.0,
-            "upgrade": 2.0,
-            "bullish": 2.0,
-            "bearish": -2.0,
-            "rally": 2.0,
-            "sell-off": -2.0,
-            "recession": -2.5,
-            "growth": 1.5,
-            "profit": 1.5,
-            "loss": -1.5,
-            "bankruptcy": -4.0,
-            "acquisition": 1.5,
-            "merger": 1.5,
-            "lawsuit": -1.5,
-            "investigation": -2.0,
-            "fine": -2.0,
-            "penalty": -2.0,
-            "regulatory approval": 2.0,
-            "fda approval": 3.0,
-            "clinical trial success": 3.0,
-            "clinical trial failure": -3.0,
-            "patent": 1.5,
-            "innovation": 2.0,
-            "layoffs": -2.0,
-            "job cuts": -2.0,
-            "restructuring": -1.0,
-            "debt": -1.0,
-            "default": -3.0,
-            "dividend increase": 2.0,
-            "dividend cut": -2.0,
-            "stock buyback": 1.5,
-            "overvalued": -1.5,
-            "undervalued": 1.5,
-        }
-        
-        self.vader.lexicon.update(financial_lexicon)
+        # The bundled lexicon already contains the single-word terms; updating
+        # again keeps NLTK's fallback lexicon and a stale artifact consistent.
+        # VADER only looks up single tokens; multi-word phrases go to a phrase matcher.
+        self.vader.lexicon.update({term: score for term, score in FINANCIAL_LEXICON.items() if ' ' not in term})
+        self.phrase_matcher = PhraseMatcher({term: score for term, score in FINANCIAL_LEXICON.items() if ' ' in term})
     
+    def _compound_score(self, text):
+        compound = self.vader.polarity_scores(text)['compound']
+        phrase_score = self.phrase_matcher.score(text)
+        if not phrase_score:
+            return compound
+
+        # Undo VADER's normalization to get its raw valence sum, add the phrase
+        # valences and normalize again.
+        compound = max(min(compound, MAX_COMPOUND), -MAX_COMPOUND)
+        raw_score = compound * math.sqrt(VADER_ALPHA / (1 - compound ** 2))
+        total = raw_score + phrase_score
+        return round(total / math.sqrt(total ** 2 + VADER_ALPHA), 4)
+
+    def score_texts(self, texts, processes=SENTIMENT_PROCESSES):
+        """Compound scores for many texts; identical texts are scored once and cached across calls.
+
+        When `processes` > 0 and enough texts miss the cache, they are scored in a process pool.
+        """
+        keys = [_score_cache.key(text) for text in texts]
+        scores = {}
+        misses = {}
+        for key, text in zip(keys, texts):
+            if key in scores or key in misses:
+                continue
+            score = _score_cache.get(key)
+            if score is None:
+                misses[key] = text
+            else:
+                scores[key] = score
+
+        if misses:
+            miss_keys = list(misses)
+            miss_texts = list(misses.values())
+            if processes and len(miss_texts) >= SENTIMENT_PROCESS_THRESHOLD:
+                chunk_size = max(1, len(miss_texts) // (processes * 4))
+                chunks = [miss_texts[i:i + chunk_size] for i in range(0, len(miss_texts), chunk_size)]
+                computed = [score for chunk in _get_process_pool(processes).map(_score_in_worker, chunks) for score in chunk]
+            else:
+                computed = [self._compound_score(text) for text in miss_texts]
+
+            for key, score in zip(miss_keys, computed):
+                _score_cache.put(key, score)
+                scores[key] = score
+
+        return [scores[key] for key in keys]
+
+    def _classify(self, compound_score):
+        if compound_score >= 0.25:
+            sentiment = "Positive"
+            confidence = "High" if compound_score >= 0.5 else "Medium"
+        elif compound_score <= -0.25:
+            sentiment = "Negative"
+            confidence = "High" if compound_score <= -0.5 else "Medium"
+        else:
+            sentiment = "Neutral"
+            confidence = "Medium" if abs(compound_score) <= 0.1 else "Low"
+        return sentiment, confidence
+
     def analyze_news_sentiment(self, news_articles):
+        texts = []
         for article in news_articles:
             combined_text = ""
             
@@ -70,19 +212,15 @@ class SentimentAnalyzer:
             if article.get('summary'):
                 combined_text += article['summary']
             
+            texts.append(combined_text)
+        
+        scores = self.score_texts([text for text in texts if text])
+        scores.reverse()
+        
+        for article, combined_text in zip(news_articles, texts):
             if combined_text:
-                sentiment_score = self.vader.polarity_scores(combined_text)
-                compound_score = sentiment_score['compound']
-                
-                if compound_score >= 0.25:
-                    sentiment = "Positive"
-                    confidence = "High" if compound_score >= 0.5 else "Medium"
-                elif compound_score <= -0.25:
-                    sentiment = "Negative"
-                    confidence = "High" if compound_score <= -0.5 else "Medium"
-                else:
-                    sentiment = "Neutral"
-                    confidence = "Medium" if abs(compound_score) <= 0.1 else "Low"
+                compound_score = scores.pop()
+                sentiment, confidence = self._classify(compound_score)
                 
                 article['sentiment'] = sentiment
                 article['sentiment_score'] = round(compound_score, 2)
@@ -102,18 +240,8 @@ class SentimentAnalyzer:
                 "confidence": "Low"
             }
         
-        sentiment_score = self.vader.polarity_scores(text)
-        compound_score = sentiment_score['compound']
-        
-        if compound_score >= 0.25:
-            sentiment = "Positive"
-            confidence = "High" if compound_score >= 0.5 else "Medium"
-        elif compound_score <= -0.25:
-            sentiment = "Negative"
-            confidence = "High" if compound_score <= -0.5 else "Medium"
-        else:
-            sentiment = "Neutral"
-            confidence = "Medium" if abs(compound_score) <= 0.1 else "Low"
+        compound_score = self.score_texts([text])[0]
+        sentiment, confidence = self._classify(compound_score)
         
         return {
             "sentiment": sentiment,
@@ -150,15 +278,7 @@ class SentimentAnalyzer:
         neutral_count = sum(1 for article in news_articles if article.get('sentiment') == "Neutral")
         
         # Determine overall sentiment
-        if avg_score >= 0.25:
-            sentiment = "Positive"
-            confidence = "High" if avg_score >= 0.5 else "Medium"
-        elif avg_score <= -0.25:
-            sentiment = "Negative"
-            confidence = "High" if avg_score <= -0.5 else "Medium"
-        else:
-            sentiment = "Neutral"
-            confidence = "Medium" if abs(avg_score) <= 0.1 else "Low"
+        sentiment, confidence = self._classify(avg_score)
         
         return {
             "sentiment": sentiment,
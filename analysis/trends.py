@@ -1,110 +1,471 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from config import PRICE_HISTORY_TTL
+from storage.price_store import get_price_store
+from data_collectors.rate_limiter import get_rate_limiter
+import threading
+import time
+import warnings
+
+# Calendar span of each yfinance period string; None means full history.
+PERIOD_OFFSETS = {
+    '1d': {'days': 1}, '5d': {'days': 5}, '1mo': {'months': 1}, '3mo': {'months': 3},
+    '6mo': {'months': 6}, '1y': {'years': 1}, '2y': {'years': 2}, '5y': {'years': 5},
+    '10y': {'years': 10}, 'max': None,
+}
+DAY_SECONDS = 86400
+# Stored history may start this much after the requested start (weekends, holidays).
+BACKFILL_SLACK_DAYS = 7
+# Already-stored bars re-fetched on each update to detect split/dividend re-adjustment.
+OVERLAP_DAYS = 5
+
+GROWTH_TREND_COLUMNS = [
+    "start_date", "end_date", "growth_percentage", "start_price", "end_price",
+    "high_price", "low_price", "volatility", "trend",
+]
+
+FORECAST_COLUMNS = [
+    "ticker", "horizon_days", "current_price", "forecast_price",
+    "forecast_lower", "forecast_upper", "forecast_change_percent",
+]
+# Number of trailing moving-average points whose average step is extrapolated.
+MA_SLOPE_POINTS = 5
+FORECAST_BAND_Z = 1.96
+
+class PriceHistoryProvider:
+    def __init__(self, ttl=PRICE_HISTORY_TTL, store=None):
+        self.ttl = ttl
+        self.store = store or get_price_store()
+        self._cache = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def get_history(self, ticker_symbol, period='1y'):
+        columns = self.get_arrays(ticker_symbol, period)
+        if columns is None:
+            return pd.DataFrame()
+
+        return pd.DataFrame({
+            'Open': columns['open'].astype(np.float64),
+            'High': columns['high'].astype(np.float64),
+            'Low': columns['low'].astype(np.float64),
+            'Close': columns['close'].astype(np.float64),
+            'Volume': columns['volume'],
+        }, index=pd.to_datetime(columns['timestamp'], unit='s', utc=True).tz_convert(self.get_timezone(ticker_symbol)))
+
+    def get_timezone(self, ticker_symbol):
+        """Timezone of the listing exchange; bars are stamped at its local midnight."""
+        return self._read_meta(ticker_symbol.upper()).get('timezone') or 'UTC'
+
+    def get_arrays(self, ticker_symbol, period='1y'):
+        """Return the series as a dict of numpy columns (timestamp, open, high, low, close, volume)."""
+        key = (ticker_symbol.upper(), period)
+
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+
+        # One fetch per key: concurrent callers for the same series wait for it.
+        with key_lock:
+            cached = self._cache.get(key)
+            if cached and time.time() - cached[0] < self.ttl:
+                return cached[1]
+
+            columns = self._load_history(ticker_symbol.upper(), period)
+            if columns is not None:
+                with self._lock:
+                    self._evict_expired()
+                    self._cache[key] = (time.time(), columns)
+            return columns
+
+    def _load_history(self, ticker_symbol, period):
+        now = time.time()
+        meta = self._read_meta(ticker_symbol)
+        timezone = meta.get('timezone') or 'UTC'
+
+        try:
+            stored = self.store.read(ticker_symbol)
+        except Exception as e:
+            print(f"Error reading price store for {ticker_symbol}: {e}")
+            stored = None
+
+        full_fetch = self._needs_full_fetch(stored, self._period_start(now, period, timezone), period, meta)
+        if not full_fetch:
+            last = int(stored['timestamp'][-1])
+            overlap_start = (pd.Timestamp(last - OVERLAP_DAYS * DAY_SECONDS, unit='s', tz='UTC')
+                             .tz_convert(timezone).strftime('%Y-%m-%d'))
+            fetched, fetched_timezone = self._fetch_columns(ticker_symbol, start=overlap_start)
+            full_fetch = self._adjusted_since_stored(stored, fetched)
+        del stored
+
+        if full_fetch:
+            fetched, fetched_timezone = self._fetch_columns(ticker_symbol, period=period)
+            provisional = self._save(ticker_symbol, fetched, now, replace=True)
+            if fetched is not None:
+                timezone = fetched_timezone or timezone
+                self._write_meta(ticker_symbol, {'timezone': timezone, 'period': period})
+            start = self._keep_fetched_start(self._period_start(now, period, timezone), fetched)
+        else:
+            provisional = self._save(ticker_symbol, fetched, now, replace=False)
+            if fetched_timezone and fetched_timezone != meta.get('timezone'):
+                timezone = fetched_timezone
+                self._write_meta(ticker_symbol, dict(meta, timezone=timezone))
+            start = self._period_start(now, period, timezone)
+
+        return self._build_columns(ticker_symbol, start, provisional)
+
+    @staticmethod
+    def _needs_full_fetch(stored, start, period, meta):
+        if stored is None:
+            return True
+        if start is None:
+            # 'max' has no start to compare with; only an earlier 'max' fetch covers it.
+            return meta.get('period') != period
+        return stored['timestamp'][0] > start + BACKFILL_SLACK_DAYS * DAY_SECONDS
+
+    @staticmethod
+    def _period_start(now, period, timezone='UTC'):
+        """First calendar day of `period` ending now, as the timestamp of that
+        day's midnight in the exchange's `timezone`.
+
+        Trimming on whole local days keeps the bar a period fetch starts with,
+        whatever the current time of day.
+        """
+        offset = PERIOD_OFFSETS.get(period, {'years': 1})
+        if offset is None:
+            return None
+        start = (pd.Timestamp(now, unit='s', tz='UTC').tz_convert(timezone) - pd.DateOffset(**offset)).normalize()
+        return int(start.timestamp())
+
+    @staticmethod
+    def _keep_fetched_start(start, fetched):
+        # Right after a full period fetch, the series is exactly what it returned.
+        if start is None or fetched is None or not len(fetched['timestamp']):
+            return start
+        return min(start, int(fetched['timestamp'][0]))
+
+    def _fetch_history(self, ticker_symbol, **kwargs):
+        import yfinance as yf
+
+        get_rate_limiter().acquire("finance.yahoo.com")
+        return yf.Ticker(ticker_symbol).history(**kwargs)
+
+    def _fetch_columns(self, ticker_symbol, **kwargs):
+        """Fetched bars as columns, plus the name of the timezone they were indexed in."""
+        hist = self._fetch_history(ticker_symbol, **kwargs)
+        timezone = getattr(getattr(hist, 'index', None), 'tz', None)
+        return self._to_columns(hist), str(timezone) if timezone is not None else None
+
+    def _read_meta(self, ticker_symbol):
+        try:
+            return self.store.read_meta(ticker_symbol)
+        except Exception as e:
+            print(f"Error reading price store metadata for {ticker_symbol}: {e}")
+            return {}
+
+    def _write_meta(self, ticker_symbol, meta):
+        try:
+            self.store.write_meta(ticker_symbol, meta)
+        except Exception as e:
+            print(f"Error writing price store metadata for {ticker_symbol}: {e}")
+
+    def _to_columns(self, hist):
+        if hist is None or hist.empty:
+            return None
+        return {
+            'timestamp': hist.index.as_unit('s').asi8,
+            'open': hist['Open'].to_numpy(),
+            'high': hist['High'].to_numpy(),
+            'low': hist['Low'].to_numpy(),
+            'close': hist['Close'].to_numpy(),
+            'volume': hist['Volume'].to_numpy(),
+        }
+
+    def _adjusted_since_stored(self, stored, fetched):
+        if fetched is None:
+            return False
+        positions = np.searchsorted(stored['timestamp'], fetched['timestamp'])
+        positions = np.minimum(positions, len(stored['timestamp']) - 1)
+        overlap = stored['timestamp'][positions] == fetched['timestamp']
+        if not overlap.any():
+            return False
+        stored_close = np.asarray(stored['close'][positions[overlap]], dtype=np.float64)
+        return not np.allclose(stored_close, fetched['close'][overlap], rtol=1e-4)
+
+    def _save(self, ticker_symbol, columns, now, replace):
+        """Persist completed bars and return the still-forming ones, which stay in memory only."""
+        if columns is None:
+            return None
+
+        final = columns['timestamp'] + DAY_SECONDS <= now
+        try:
+            completed = {name: values[final] for name, values in columns.items()}
+            if replace:
+                self.store.replace(ticker_symbol, completed)
+            else:
+                self.store.append(ticker_symbol, completed)
+        except Exception as e:
+            print(f"Error writing price store for {ticker_symbol}: {e}")
+            return columns
+
+        return {name: values[~final] for name, values in columns.items()}
+
+    def _build_columns(self, ticker_symbol, start, provisional):
+        stored = self.store.read(ticker_symbol)
+        parts = []
+        if stored is not None:
+            first = int(np.searchsorted(stored['timestamp'], start)) if start is not None else 0
+            parts.append({name: np.asarray(values[first:]) for name, values in stored.items()})
+        if provisional is not None and len(provisional['timestamp']):
+            if parts and len(parts[0]['timestamp']):
+                keep = provisional['timestamp'] > parts[0]['timestamp'][-1]
+                provisional = {name: values[keep] for name, values in provisional.items()}
+            parts.append(provisional)
+
+        columns = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]} if parts else None
+        if columns is None or not len(columns['timestamp']):
+            return None
+        return columns
+
+    def _evict_expired(self):
+        now = time.time()
+        for key in [k for k, (fetched_at, _) in self._cache.items() if now - fetched_at >= self.ttl]:
+            del self._cache[key]
+            self._locks.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+_price_history = None
+_price_history_lock = threading.Lock()
+
+def get_price_history_provider():
+    global _price_history
+    if _price_history is None:
+        with _price_history_lock:
+            if _price_history is None:
+                _price_history = PriceHistoryProvider()
+    return _price_history
 
 class TrendsAnalyzer:
-    def __init__(self):
-        pass
+    def __init__(self, price_history=None):
+        self.price_history = price_history or get_price_history_provider()
     
     def get_growth_trend(self, ticker_symbol, period='1y'):
         try:
-            import yfinance as yf
-            
             ticker_symbol = ticker_symbol.replace('$', '').strip()
             
             if not ticker_symbol:
                 print("Error: Ticker symbol is empty.")
                 return None
             
-            ticker = yf.Ticker(ticker_symbol)
-            hist = ticker.history(period=period)
+            trends = self.get_growth_trends([ticker_symbol], period)
             
-            if hist.empty:
+            if trends.empty:
                 print(f"Error: No data found for ticker symbol '{ticker_symbol}'.")
                 return None
             
-            start_price = hist['Close'].iloc[0]
-            end_price = hist['Close'].iloc[-1]
-            
-            growth_pct = ((end_price - start_price) / start_price) * 100
-            
-            high_price = hist['High'].max()
-            low_price = hist['Low'].min()
-            
-            daily_returns = hist['Close'].pct_change().dropna()
-            volatility = daily_returns.std() * 100
-            
-            if growth_pct >= 10:
-                trend = "Strong Growth"
-            elif growth_pct >= 3:
-                trend = "Moderate Growth"
-            elif growth_pct >= -3:
-                trend = "Stable"
-            elif growth_pct >= -10:
-                trend = "Moderate Decline"
-            else:
-                trend = "Strong Decline"
-            
+            row = trends.iloc[0]
             return {
                 "ticker": ticker_symbol,
-                "start_date": hist.index[0].strftime('%Y-%m-%d'),
-                "end_date": hist.index[-1].strftime('%Y-%m-%d'),
-                "growth_percentage": round(growth_pct, 2),
-                "start_price": round(start_price, 2),
-                "end_price": round(end_price, 2),
-                "high_price": round(high_price, 2),
-                "low_price": round(low_price, 2),
-                "volatility": round(volatility, 2),
-                "trend": trend
+                "start_date": row['start_date'],
+                "end_date": row['end_date'],
+                "growth_percentage": row['growth_percentage'],
+                "start_price": row['start_price'],
+                "end_price": row['end_price'],
+                "high_price": row['high_price'],
+                "low_price": row['low_price'],
+                "volatility": row['volatility'],
+                "trend": row['trend']
             }
         except Exception as e:
             print(f"Error analyzing growth trend: {e}")
             return None
+
+    def get_growth_trends(self, ticker_symbols, period='1y'):
+        """Growth, range, volatility and trend label for many tickers in one vectorized pass.
+
+        Returns a DataFrame indexed by ticker; tickers without price data are left out.
+        """
+        tickers, timestamps, prices, timezones = self._price_matrix(ticker_symbols, period)
+        if not tickers:
+            return pd.DataFrame(columns=GROWTH_TREND_COLUMNS)
+
+        close = prices['close']
+        valid = ~np.isnan(close)
+        rows = np.arange(close.shape[0])[:, None]
+        cols = np.arange(close.shape[1])
+
+        first = valid.argmax(axis=0)
+        last = close.shape[0] - 1 - valid[::-1].argmax(axis=0)
+        start_price = close[first, cols]
+        end_price = close[last, cols]
+        growth_pct = (end_price - start_price) / start_price * 100
+
+        # Daily returns against each ticker's previous traded bar, so calendar gaps
+        # introduced by aligning tickers do not count as flat days.
+        last_valid = np.maximum.accumulate(np.where(valid, rows, -1), axis=0)
+        previous = np.vstack([np.full((1, close.shape[1]), -1), last_valid[:-1]])
+        previous_close = np.where(previous >= 0, close[np.maximum(previous, 0), cols], np.nan)
+        daily_returns = np.where(valid, close / previous_close - 1, np.nan)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            volatility = np.nanstd(daily_returns, axis=0, ddof=1) * 100
+
+        trend = np.select(
+            [growth_pct >= 10, growth_pct >= 3, growth_pct >= -3, growth_pct >= -10],
+            ["Strong Growth", "Moderate Growth", "Stable", "Moderate Decline"],
+            default="Strong Decline"
+        )
+
+        # Dates are calendar days at the exchange, as yfinance indexes them.
+        times = pd.to_datetime(timestamps, unit='s', utc=True)
+        start_dates = [times[i].tz_convert(tz).strftime('%Y-%m-%d') for i, tz in zip(first, timezones)]
+        end_dates = [times[i].tz_convert(tz).strftime('%Y-%m-%d') for i, tz in zip(last, timezones)]
+        return pd.DataFrame({
+            "start_date": start_dates,
+            "end_date": end_dates,
+            "growth_percentage": np.round(growth_pct, 2),
+            "start_price": np.round(start_price, 2),
+            "end_price": np.round(end_price, 2),
+            "high_price": np.round(np.nanmax(prices['high'], axis=0), 2),
+            "low_price": np.round(np.nanmin(prices['low'], axis=0), 2),
+            "volatility": np.round(volatility, 2),
+            "trend": trend,
+        }, index=pd.Index(tickers, name="ticker"))
+
+    def _price_matrix(self, ticker_symbols, period):
+        """Align many tickers on the union of their bar timestamps (NaN where a ticker has no bar).
+
+        Also returns each ticker's exchange timezone.
+        """
+        series = {}
+        for ticker_symbol in ticker_symbols:
+            ticker_symbol = ticker_symbol.replace('$', '').strip()
+            if not ticker_symbol or ticker_symbol in series:
+                continue
+            try:
+                columns = self.price_history.get_arrays(ticker_symbol, period)
+            except Exception as e:
+                print(f"Error loading price history for {ticker_symbol}: {e}")
+                columns = None
+            if columns is not None:
+                series[ticker_symbol] = columns
+
+        if not series:
+            return [], np.array([], dtype=np.int64), {}, []
+
+        timestamps = np.unique(np.concatenate([columns['timestamp'] for columns in series.values()]))
+        prices = {name: np.full((len(timestamps), len(series)), np.nan) for name in ('open', 'high', 'low', 'close')}
+        for j, columns in enumerate(series.values()):
+            positions = np.searchsorted(timestamps, columns['timestamp'])
+            for name, matrix in prices.items():
+                matrix[positions, j] = columns[name]
+
+        return list(series), timestamps, prices, [self.price_history.get_timezone(ticker) for ticker in series]
     
-    def forecast_trend(self, ticker_symbol, days_ahead=30):
+    def forecast_trend(self, ticker_symbol, days_ahead=30, window=30):
         try:
-            import yfinance as yf
-            
             ticker_symbol = ticker_symbol.replace('$', '').strip()
             
             if not ticker_symbol:
                 print("Error: Ticker symbol is empty.")
                 return None
             
-            ticker = yf.Ticker(ticker_symbol)
-            hist = ticker.history(period='1y')
+            forecasts = self.forecast_trends([ticker_symbol], horizons=[days_ahead], window=window)
             
-            if hist.empty:
+            if forecasts.empty:
                 print(f"Error: No data found for ticker symbol '{ticker_symbol}'.")
                 return None
             
-            ts_data = hist['Close'].values
-            
-            window = 30
-            if len(ts_data) < window:
-                window = len(ts_data) // 2
-            
-            moving_avg = np.convolve(ts_data, np.ones(window)/window, mode='valid')
-            
-            last_values = moving_avg[-5:]
-            avg_change = np.mean(np.diff(last_values))
-            
-            forecast = []
-            last_value = moving_avg[-1]
-            
-            for _ in range(days_ahead):
-                next_value = last_value + avg_change
-                forecast.append(next_value)
-                last_value = next_value
-            
+            row = forecasts.iloc[0]
             return {
                 "ticker": ticker_symbol,
-                "current_price": round(ts_data[-1], 2),
-                "forecast_price": round(forecast[-1], 2),
-                "forecast_change_percent": round(((forecast[-1] - ts_data[-1]) / ts_data[-1]) * 100, 2),
+                "current_price": row['current_price'],
+                "forecast_price": row['forecast_price'],
+                "forecast_change_percent": row['forecast_change_percent'],
+                "forecast_lower": row['forecast_lower'],
+                "forecast_upper": row['forecast_upper'],
                 "forecast_period_days": days_ahead,
                 "forecast_confidence": "Low"
             }
         except Exception as e:
             print(f"Error forecasting trend: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def forecast_trends(self, ticker_symbols, horizons=(30,), window=30, period='1y'):
+        """Project every ticker over every horizon (in trading days) in one vectorized pass.
+
+        The projection extends the slope of the last few points of the `window`-day
+        moving average; the band is +/- FORECAST_BAND_Z standard deviations of the
+        daily price change over the same window, widened with sqrt(horizon).
+        Returns one row per (ticker, horizon).
+        """
+        closes = {}
+        for ticker_symbol in ticker_symbols:
+            ticker_symbol = ticker_symbol.replace('$', '').strip()
+            if not ticker_symbol or ticker_symbol in closes:
+                continue
+            try:
+                columns = self.price_history.get_arrays(ticker_symbol, period)
+            except Exception as e:
+                print(f"Error loading price history for {ticker_symbol}: {e}")
+                columns = None
+            if columns is not None:
+                closes[ticker_symbol] = columns['close']
+
+        horizons = np.asarray(horizons, dtype=np.float64)
+        if not closes:
+            return pd.DataFrame(columns=FORECAST_COLUMNS)
+
+        # Right-align every series so the latest close of each ticker sits in the last column.
+        lengths = np.array([len(values) for values in closes.values()])
+        width = lengths.max()
+        prices = np.zeros((len(closes), width))
+        for i, values in enumerate(closes.values()):
+            prices[i, width - len(values):] = values
+
+        rows = np.arange(len(closes))
+        windows = np.where(lengths >= window, window, lengths // 2)
+        ma_points = np.minimum(lengths - windows + 1, MA_SLOPE_POINTS)
+        usable = (windows >= 1) & (ma_points >= 2)
+        windows = np.maximum(windows, 1)
+        ma_points = np.maximum(ma_points, 2)
+
+        # Moving averages from prefix sums: mean of prices[end - w + 1 .. end].
+        sums = np.concatenate([np.zeros((len(closes), 1)), np.cumsum(prices, axis=1)], axis=1)
+        ma_last = (sums[rows, width] - sums[rows, np.maximum(width - windows, 0)]) / windows
+        back = width - ma_points + 1
+        ma_back = (sums[rows, back] - sums[rows, np.maximum(back - windows, 0)]) / windows
+        slope = (ma_last - ma_back) / (ma_points - 1)
+
+        # Rolling std of daily changes over the window, again from prefix sums.
+        changes = np.diff(prices, axis=1)
+        change_sums = np.concatenate([np.zeros((len(closes), 1)), np.cumsum(changes, axis=1)], axis=1)
+        change_squares = np.concatenate([np.zeros((len(closes), 1)), np.cumsum(changes ** 2, axis=1)], axis=1)
+        counts = np.minimum(windows, lengths - 1)
+        start = np.maximum(width - 1 - counts, 0)
+        s1 = change_sums[rows, width - 1] - change_sums[rows, start]
+        s2 = change_squares[rows, width - 1] - change_squares[rows, start]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            variance = (s2 - s1 ** 2 / counts) / (counts - 1)
+        sigma = np.where(counts > 1, np.sqrt(np.maximum(variance, 0)), 0.0)
+
+        current = prices[:, -1]
+        forecast = ma_last[:, None] + slope[:, None] * horizons[None, :]
+        spread = FORECAST_BAND_Z * sigma[:, None] * np.sqrt(horizons)[None, :]
+        change_pct = (forecast - current[:, None]) / current[:, None] * 100
+
+        tickers = np.array(list(closes), dtype=object)[usable]
+        count = len(tickers)
+        return pd.DataFrame({
+            "ticker": np.repeat(tickers, len(horizons)),
+            "horizon_days": np.tile(horizons.astype(int), count),
+            "current_price": np.repeat(np.round(current[usable], 2), len(horizons)),
+            "forecast_price": np.round(forecast[usable], 2).ravel(),
+            "forecast_lower": np.round(forecast[usable] - spread[usable], 2).ravel(),
+            "forecast_upper": np.round(forecast[usable] + spread[usable], 2).ravel(),
+            "forecast_change_percent": np.round(change_pct[usable], 2).ravel(),
+        }, columns=FORECAST_COLUMNS)
@@ -0,0 +1,111 @@
+# api/jobs.py
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from core import get_research_engine
+from config import RESEARCH_JOB_WORKERS, RESEARCH_JOB_QUEUE_SIZE, RESEARCH_JOB_RETENTION
+
+class JobQueueFull(Exception):
+    pass
+
+class ResearchJobManager:
+    """Runs research in a bounded background worker pool.
+
+    At most `max_workers` jobs run at once and at most `max_queue` more wait;
+    submit() raises JobQueueFull beyond that. Finished jobs are kept for
+    `retention` seconds so clients can poll for the result. Without an explicit
+    `engine` the shared one from get_research_engine() is used. Jobs are not
+    subject to the research deadline: callers are already not waiting on them.
+    """
+
+    def __init__(self, engine=None, max_workers=RESEARCH_JOB_WORKERS,
+                 max_queue=RESEARCH_JOB_QUEUE_SIZE, retention=RESEARCH_JOB_RETENTION):
+        self._engine = engine
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="research-job")
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    @property
+    def engine(self):
+        return self._engine or get_research_engine()
+
+    def submit(self, company_name, progress_callback=None, done_callback=None, sections=None):
+        """Queue a research job. Optional callbacks see each finished stage and the finished job."""
+        if not self._slots.acquire(blocking=False):
+            raise JobQueueFull("Research job queue is full")
+
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "company_name": company_name,
+            "sections": sections,
+            "status": "queued",
+            "progress": {"completed": 0, "total": None, "stages": []},
+            "result": None,
+            "error": None,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+        }
+        with self._lock:
+            self._purge_finished()
+            self._jobs[job["job_id"]] = job
+
+        try:
+            self._executor.submit(self._run, job, progress_callback, done_callback)
+        except Exception:
+            self._slots.release()
+            raise
+        return self.get(job["job_id"])
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            view = dict(job)
+            view["progress"] = dict(job["progress"], stages=list(job["progress"]["stages"]))
+            return view
+
+    def queue_depth(self):
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job["status"] == "queued")
+
+    def _run(self, job, progress_callback=None, done_callback=None):
+        try:
+            with self._lock:
+                job["status"] = "running"
+                job["started_at"] = time.time()
+
+            def on_stage(stage, result, completed, total):
+                with self._lock:
+                    job["progress"]["stages"].append(stage)
+                    job["progress"]["completed"] = completed
+                    job["progress"]["total"] = total
+                if progress_callback:
+                    progress_callback(stage, result, completed, total)
+
+            result = self.engine.research_company(job["company_name"], progress_callback=on_stage,
+                                                  sections=job["sections"], deadline=0)
+
+            with self._lock:
+                job["result"] = result
+                job["status"] = "completed"
+        except Exception as e:
+            with self._lock:
+                job["error"] = f"Research failed: {str(e)}"
+                job["status"] = "failed"
+        finally:
+            with self._lock:
+                job["finished_at"] = time.time()
+            self._slots.release()
+            if done_callback:
+                done_callback(self.get(job["job_id"]))
+
+    def _purge_finished(self):
+        cutoff = time.time() - self.retention
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job["finished_at"] is not None and job["finished_at"] < cutoff]:
+            del self._jobs[job_id]
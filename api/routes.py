@@ -1,9 +1,39 @@
 # api/routes.py
-from flask import Blueprint, request, jsonify
-from core import ResearchEngine
+from flask import Blueprint, Response, request, jsonify, url_for, stream_with_context
+from core import get_research_engine, normalize_sections, ResearchBusy
+from api.jobs import ResearchJobManager, JobQueueFull
+from config import RESEARCH_JOB_RETRY_AFTER
+from datetime import datetime, timedelta
+import json
+import queue
 
 api_blueprint = Blueprint('api', __name__)
-research_engine = ResearchEngine()
+research_jobs = ResearchJobManager()
+
+# Engine stage -> (section name sent to the client, key in the final research result).
+STREAM_SECTIONS = {
+    "overview": ("overview", "overview"),
+    "financials": ("financials", "financials"),
+    "news": ("news", "recent_news"),
+    "sentiment": ("sentiment", "recent_news"),
+    "social": ("social", "social_media_sentiment"),
+    "competitors": ("competitors", "competitors"),
+    "trends": ("trends", "growth_trends"),
+}
+
+def _ndjson(payload):
+    return json.dumps(payload, default=str) + "\n"
+
+def _requested_sections(source):
+    # `fields` and `sections` are synonyms; both take a comma-separated list.
+    return normalize_sections(source.get('fields') or source.get('sections'))
+
+def _queue_full_response(message='Too many research jobs queued, retry later'):
+    response = jsonify({
+        'error': message
+    })
+    response.headers['Retry-After'] = str(RESEARCH_JOB_RETRY_AFTER)
+    return response, 429
 
 @api_blueprint.route('/research', methods=['GET'])
 def research_company():
@@ -15,16 +45,156 @@ def research_company():
         }), 400
     
     try:
-        results = research_engine.research_company(company_name)
+        sections = _requested_sections(request.args)
+    except ValueError as e:
+        return jsonify({
+            'error': str(e)
+        }), 400
+    
+    deadline = request.args.get('deadline', type=float)
+    if deadline is not None and deadline < 0:
+        return jsonify({
+            'error': 'deadline must be a non-negative number of seconds'
+        }), 400
+    
+    try:
+        results = get_research_engine().research_company(company_name, sections=sections, deadline=deadline)
         return jsonify(results)
+    except ResearchBusy:
+        return _queue_full_response('Too many research requests in progress, retry later')
     except Exception as e:
         return jsonify({
             'error': f'Research failed: {str(e)}'
         }), 500
 
+@api_blueprint.route('/research/jobs', methods=['POST'])
+def create_research_job():
+    payload = request.get_json(silent=True) or {}
+    company_name = payload.get('company') or request.form.get('company') or request.args.get('company')
+    
+    if not company_name:
+        return jsonify({
+            'error': 'Missing company name parameter'
+        }), 400
+    
+    try:
+        sections = _requested_sections(payload if (payload.get('fields') or payload.get('sections')) else request.args)
+    except ValueError as e:
+        return jsonify({
+            'error': str(e)
+        }), 400
+    
+    try:
+        job = research_jobs.submit(company_name, sections=sections)
+    except JobQueueFull:
+        return _queue_full_response()
+    
+    response = jsonify(job)
+    response.headers['Location'] = url_for('api.get_research_job', job_id=job['job_id'])
+    return response, 202
+
+@api_blueprint.route('/research/jobs/<job_id>', methods=['GET'])
+def get_research_job(job_id):
+    job = research_jobs.get(job_id)
+    
+    if job is None:
+        return jsonify({
+            'error': 'Unknown research job'
+        }), 404
+    
+    return jsonify(job)
+
+@api_blueprint.route('/research/stream', methods=['GET'])
+def stream_research():
+    company_name = request.args.get('company')
+    
+    if not company_name:
+        return jsonify({
+            'error': 'Missing company name parameter'
+        }), 400
+    
+    try:
+        sections = _requested_sections(request.args)
+    except ValueError as e:
+        return jsonify({
+            'error': str(e)
+        }), 400
+    
+    events = queue.Queue()
+    
+    # Serialize in the engine thread: later stages may mutate earlier results in place.
+    def on_stage(stage, result, completed, total):
+        if stage in STREAM_SECTIONS:
+            section, key = STREAM_SECTIONS[stage]
+            events.put(_ndjson({
+                'event': 'section',
+                'section': section,
+                'key': key,
+                'data': result,
+                'completed': completed,
+                'total': total
+            }))
+    
+    def on_done(job):
+        if job['status'] == 'completed':
+            events.put(_ndjson({'event': 'done', 'job_id': job['job_id']}))
+        else:
+            events.put(_ndjson({'event': 'error', 'job_id': job['job_id'], 'error': job['error']}))
+        events.put(None)
+    
+    try:
+        job = research_jobs.submit(company_name, progress_callback=on_stage, done_callback=on_done, sections=sections)
+    except JobQueueFull:
+        return _queue_full_response()
+    
+    def generate():
+        yield _ndjson({'event': 'start', 'job_id': job['job_id'], 'company_name': company_name})
+        while True:
+            line = events.get()
+            if line is None:
+                return
+            yield line
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@api_blueprint.route('/research/history', methods=['GET'])
+def research_history():
+    company_name = request.args.get('company')
+    section = request.args.get('section')
+    days = request.args.get('days', default=90, type=int)
+    
+    if not company_name:
+        return jsonify({
+            'error': 'Missing company name parameter'
+        }), 400
+    
+    db = get_research_engine().db
+    since = datetime.now() - timedelta(days=days)
+    if section:
+        return jsonify({
+            'company_name': company_name,
+            'section': section,
+            'history': db.get_section_history(company_name, section, since=since)
+        })
+    return jsonify({
+        'company_name': company_name,
+        'versions': db.list_research_versions(company_name, since=since)
+    })
+
 @api_blueprint.route('/health', methods=['GET'])
 def health_check():
     return jsonify({
         'status': 'ok',
-        'service': 'company-research-agent'
-    })
\ No newline at end of file
+        'service': 'company-research-agent',
+        'circuits': _circuit_states(),
+        'research_jobs_queued': research_jobs.queue_depth()
+    })
+
+def _circuit_states():
+    # Imported here to keep the HTTP stack out of the app's import path.
+    from data_collectors.http_client import circuit_states
+    return circuit_states()
\ No newline at end of file
@@ -1,15 +1,17 @@
 # app.py
 from flask import Flask, render_template, request, jsonify
 from api.routes import api_blueprint
-from core import ResearchEngine
+from core import get_research_engine, research_key
+from storage.result_cache import ResultCache
 import json
+import threading
 
 app = Flask(__name__)
 
 # Register API blueprint
 app.register_blueprint(api_blueprint, url_prefix='/api')
 
-research_cache = {}
+research_cache = ResultCache()
 
 @app.route('/')
 def index():
@@ -25,15 +27,14 @@ def research_form():
                 'error': 'Company name is required'
             }), 400
         
-        if company_name in research_cache:
-            return jsonify(research_cache[company_name])
-        
         try:
-            engine = ResearchEngine()
-            results = engine.research_company(company_name)
-            
-            # Cache results
-            research_cache[company_name] = results
+            # Fresh results come from the cache; stale ones are served while a refresh runs.
+            # Results cut short by the research deadline are never cached.
+            results = research_cache.get_or_load(
+                research_key(company_name),
+                lambda: get_research_engine().research_company(company_name),
+                cacheable=lambda results: not results.get('partial')
+            )
             
             return jsonify(results)
         except Exception as e:
@@ -43,6 +44,10 @@ def research_form():
 
     return render_template('research_form.html')
 
+@app.route('/research/cache', methods=['GET'])
+def research_cache_stats():
+    return jsonify(research_cache.stats())
+
 @app.route('/templates/research_form.html')
 def research_form_template():
     html = """
@@ -55,7 +60,10 @@ def research_form_template():
             .container { max-width: 800px; margin: 0 auto; }
             input[type="text"] { padding: 8px; width: 300px; }
             button { padding: 8px 16px; background-color: #4CAF50; color: white; border: none; cursor: pointer; }
-            #results { margin-top: 20px; white-space: pre-wrap; }
+            #results { margin-top: 20px; }
+            .section { margin-bottom: 16px; }
+            .section pre { white-space: pre-wrap; background: #f6f6f6; padding: 8px; }
+            .pending { color: #999; }
         </style>
     </head>
     <body>
@@ -69,36 +77,95 @@ def research_form_template():
             </div>
             
             <div id="loading" style="display: none;">
-                <p>Researching... this may take a moment.</p>
+                <p>Researching... sections appear as soon as they are ready.</p>
             </div>
             
             <div id="results"></div>
         </div>
         
         <script>
-            function researchCompany() {
+            // Sections in display order; `news` is replaced by `sentiment` once scored.
+            const SECTIONS = [
+                ['overview', 'Overview'],
+                ['financials', 'Financials'],
+                ['news', 'Recent News'],
+                ['social', 'Social Media Sentiment'],
+                ['competitors', 'Competitors'],
+                ['trends', 'Growth Trends']
+            ];
+            
+            function escapeHtml(text) {
+                return text.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+            }
+            
+            function renderSection(section, data) {
+                const id = section === 'sentiment' ? 'news' : section;
+                const body = document.getElementById('section-' + id);
+                if (!body) {
+                    return;
+                }
+                body.className = '';
+                body.innerHTML = '<pre>' + escapeHtml(JSON.stringify(data, null, 2)) + '</pre>';
+            }
+            
+            function handleEvent(event) {
+                if (event.event === 'section') {
+                    renderSection(event.section, event.data);
+                } else if (event.event === 'done') {
+                    document.getElementById('loading').style.display = 'none';
+                } else if (event.event === 'error') {
+                    document.getElementById('loading').style.display = 'none';
+                    document.getElementById('results').insertAdjacentHTML('beforeend',
+                        '<h2>Error</h2><p>' + escapeHtml(event.error) + '</p>');
+                }
+            }
+            
+            async function researchCompany() {
                 const companyName = document.getElementById('company_name').value;
                 if (!companyName) {
                     alert('Please enter a company name');
                     return;
                 }
                 
+                const results = document.getElementById('results');
                 document.getElementById('loading').style.display = 'block';
-                document.getElementById('results').innerHTML = '';
+                results.innerHTML = '<h2>Research Results for ' + escapeHtml(companyName) + '</h2>' +
+                    SECTIONS.map(([id, title]) =>
+                        '<div class="section"><h3>' + title + '</h3>' +
+                        '<div id="section-' + id + '" class="pending">Loading...</div></div>'
+                    ).join('');
                 
-                fetch('/api/research?company=' + encodeURIComponent(companyName))
-                    .then(response => response.json())
-                    .then(data => {
-                        document.getElementById('loading').style.display = 'none';
-                        document.getElementById('results').innerHTML = 
-                            '<h2>Research Results for ' + companyName + '</h2>' +
-                            '<pre>' + JSON.stringify(data, null, 2) + '</pre>';
-                    })
-                    .catch(error => {
-                        document.getElementById('loading').style.display = 'none';
-                        document.getElementById('results').innerHTML = 
-                            '<h2>Error</h2><p>' + error + '</p>';
-                    });
+                try {
+                    const response = await fetch('/api/research/stream?company=' + encodeURIComponent(companyName));
+                    if (!response.ok) {
+                        const error = await response.json();
+                        throw new Error(error.error || response.statusText);
+                    }
+                    
+                    const reader = response.body.getReader();
+                    const decoder = new TextDecoder();
+                    let buffer = '';
+                    while (true) {
+                        const { value, done } = await reader.read();
+                        if (done) {
+                            break;
+                        }
+                        buffer += decoder.decode(value, { stream: true });
+                        const lines = buffer.split('\\n');
+                        buffer = lines.pop();
+                        for (const line of lines) {
+                            if (line.trim()) {
+                                handleEvent(JSON.parse(line));
+                            }
+                        }
+                    }
+                    if (buffer.trim()) {
+                        handleEvent(JSON.parse(buffer));
+                    }
+                } catch (error) {
+                    document.getElementById('loading').style.display = 'none';
+                    results.innerHTML = '<h2>Error</h2><p>' + escapeHtml(String(error.message || error)) + '</p>';
+                }
             }
         </script>
     </body>
@@ -140,4 +207,6 @@ def index_template():
     return html
 
 if __name__ == '__main__':
+    # Build collectors and analyzers in the background so the first request does not pay for it.
+    threading.Thread(target=get_research_engine().warm_up, daemon=True).start()
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
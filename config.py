@@ -22,4 +22,125 @@ HEADERS = {
 COMPANY_INFO_SOURCES = ["wikipedia", "crunchbase", "opencorporates"]
 FINANCIAL_SOURCES = ["yahoo_finance", "alpha_vantage"]
 NEWS_SOURCES = ["newsapi", "yahoo_news"]
-SOCIAL_MEDIA_SOURCES = ["twitter", "reddit"]
\ No newline at end of file
+SOCIAL_MEDIA_SOURCES = ["twitter", "reddit"]
+
+RESEARCH_CONCURRENT = os.getenv("RESEARCH_CONCURRENT", "true").lower() == "true"
+# Stage threads per research call; each call gets its own pool.
+RESEARCH_MAX_WORKERS = int(os.getenv("RESEARCH_MAX_WORKERS", "8"))
+# Threads running research that has a deadline (each with its own stage pool).
+# Late runs keep their thread until they finish; once all are busy, new calls are
+# refused with a 429 instead of queueing behind them.
+RESEARCH_BACKGROUND_WORKERS = int(os.getenv("RESEARCH_BACKGROUND_WORKERS", "8"))
+# Seconds a research call may take before it returns the sections finished so far;
+# the rest keep running and are saved for the next caller. 0 disables the deadline.
+RESEARCH_DEADLINE = float(os.getenv("RESEARCH_DEADLINE", "0"))
+
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.5"))
+# Longest pause before a retry. A 429/503 whose Retry-After asks for more is
+# returned to the caller as is instead of being retried.
+HTTP_RETRY_MAX_WAIT = float(os.getenv("HTTP_RETRY_MAX_WAIT", "5"))
+
+SYMBOL_LISTING_PATH = os.getenv("SYMBOL_LISTING_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "symbols.csv"))
+SYMBOL_FUZZY_THRESHOLD = float(os.getenv("SYMBOL_FUZZY_THRESHOLD", "0.8"))
+SYMBOL_FUZZY_MARGIN = float(os.getenv("SYMBOL_FUZZY_MARGIN", "0.1"))
+
+PRICE_HISTORY_TTL = int(os.getenv("PRICE_HISTORY_TTL", "900"))
+PRICE_STORE_DIR = os.getenv("PRICE_STORE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "prices"))
+
+SENTIMENT_CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "50000"))
+SENTIMENT_PROCESSES = int(os.getenv("SENTIMENT_PROCESSES", "0"))
+SENTIMENT_PROCESS_THRESHOLD = int(os.getenv("SENTIMENT_PROCESS_THRESHOLD", "500"))
+SENTIMENT_LEXICON_PATH = os.getenv("SENTIMENT_LEXICON_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "sentiment_lexicon.json"))
+
+WIKIPEDIA_FAST_PARSE = os.getenv("WIKIPEDIA_FAST_PARSE", "true").lower() == "true"
+
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"
+HTTP_CACHE_OFFLINE = os.getenv("HTTP_CACHE_OFFLINE", "false").lower() == "true"
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "http"))
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+HTTP_CACHE_DEFAULT_TTL = int(os.getenv("HTTP_CACHE_DEFAULT_TTL", "600"))
+# Query parameters (compared case-insensitively) that carry credentials; they are
+# removed from cached URLs and cache keys so secrets never reach the disk.
+HTTP_CACHE_SECRET_PARAMS = frozenset(["apikey", "api_key", "user_key", "key", "token",
+                                      "access_token", "client_secret", "password"])
+# Seconds a cached response stays fresh, per upstream host (subdomains included).
+HTTP_CACHE_TTLS = {
+    "wikipedia.org": 7 * 24 * 3600,
+    "api.crunchbase.com": 24 * 3600,
+    "finance.yahoo.com": 15 * 60,
+    "marketwatch.com": 15 * 60,
+    "newsapi.org": 15 * 60,
+    "reddit.com": 30 * 60,
+    "nitter.net": 30 * 60,
+    "api.twitter.com": 15 * 60,
+}
+
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "256"))
+RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", "900"))
+RESULT_CACHE_STALE_TTL = int(os.getenv("RESULT_CACHE_STALE_TTL", "3600"))
+
+RESEARCH_JOB_WORKERS = int(os.getenv("RESEARCH_JOB_WORKERS", "4"))
+RESEARCH_JOB_QUEUE_SIZE = int(os.getenv("RESEARCH_JOB_QUEUE_SIZE", "32"))
+RESEARCH_JOB_RETENTION = int(os.getenv("RESEARCH_JOB_RETENTION", "3600"))
+RESEARCH_JOB_RETRY_AFTER = int(os.getenv("RESEARCH_JOB_RETRY_AFTER", "5"))
+
+TWITTER_TOKEN_TTL = int(os.getenv("TWITTER_TOKEN_TTL", "3600"))
+TWITTER_TOKEN_RETRY = int(os.getenv("TWITTER_TOKEN_RETRY", "300"))
+
+DB_WRITE_BEHIND = os.getenv("DB_WRITE_BEHIND", "true").lower() == "true"
+DB_WRITE_QUEUE_SIZE = int(os.getenv("DB_WRITE_QUEUE_SIZE", "1000"))
+DB_WRITE_BATCH_SIZE = int(os.getenv("DB_WRITE_BATCH_SIZE", "200"))
+DB_FLUSH_INTERVAL = float(os.getenv("DB_FLUSH_INTERVAL", "0.5"))
+SNAPSHOT_HASH_CACHE_SIZE = int(os.getenv("SNAPSHOT_HASH_CACHE_SIZE", "10000"))
+
+# How long each stored research section stays fresh before its collectors run again.
+INCREMENTAL_REFRESH = os.getenv("INCREMENTAL_REFRESH", "true").lower() == "true"
+SECTION_TTLS = {
+    "overview": int(os.getenv("SECTION_TTL_OVERVIEW", str(30 * 24 * 3600))),
+    "competitors": int(os.getenv("SECTION_TTL_COMPETITORS", str(7 * 24 * 3600))),
+    "financials": int(os.getenv("SECTION_TTL_FINANCIALS", str(15 * 60))),
+    "recent_news": int(os.getenv("SECTION_TTL_RECENT_NEWS", str(15 * 60))),
+    "social_media_sentiment": int(os.getenv("SECTION_TTL_SOCIAL_MEDIA_SENTIMENT", str(30 * 60))),
+    "growth_trends": int(os.getenv("SECTION_TTL_GROWTH_TRENDS", str(15 * 60))),
+}
+MONGO_TIMEOUT_MS = int(os.getenv("MONGO_TIMEOUT_MS", "2000"))
+
+# Per-host request limits shared by every collector: (requests per second, burst).
+RATE_LIMITS = {
+    "finance.yahoo.com": (float(os.getenv("RATE_LIMIT_YAHOO", "2")), int(os.getenv("RATE_LIMIT_YAHOO_BURST", "5"))),
+    "marketwatch.com": (float(os.getenv("RATE_LIMIT_MARKETWATCH", "1")), int(os.getenv("RATE_LIMIT_MARKETWATCH_BURST", "3"))),
+    "newsapi.org": (float(os.getenv("RATE_LIMIT_NEWSAPI", "1")), int(os.getenv("RATE_LIMIT_NEWSAPI_BURST", "5"))),
+    "api.crunchbase.com": (float(os.getenv("RATE_LIMIT_CRUNCHBASE", "3")), int(os.getenv("RATE_LIMIT_CRUNCHBASE_BURST", "10"))),
+    "alphavantage.co": (float(os.getenv("RATE_LIMIT_ALPHA_VANTAGE", str(5 / 60))), int(os.getenv("RATE_LIMIT_ALPHA_VANTAGE_BURST", "2"))),
+    "reddit.com": (float(os.getenv("RATE_LIMIT_REDDIT", str(10 / 60))), int(os.getenv("RATE_LIMIT_REDDIT_BURST", "3"))),
+}
+# Longest a caller waits for a token; beyond that the request fails fast as a 429.
+RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", "5"))
+
+# (connect, read) timeouts per upstream host; others use (HTTP_CONNECT_TIMEOUT, HTTP_TIMEOUT).
+HTTP_SOURCE_TIMEOUTS = {
+    "nitter.net": (3.05, 5),
+    "reddit.com": (3.05, 6),
+    "finance.yahoo.com": (3.05, 6),
+    "marketwatch.com": (3.05, 6),
+    "wikipedia.org": (3.05, 8),
+    "api.crunchbase.com": (3.05, 8),
+    "newsapi.org": (3.05, 8),
+    "api.twitter.com": (3.05, 8),
+}
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "60"))
+# Idempotent GETs to these hosts get a second, hedged request if the first has
+# not answered after the given seconds. Off unless HTTP_HEDGING=true.
+HTTP_HEDGING = os.getenv("HTTP_HEDGING", "false").lower() == "true"
+HTTP_HEDGE_DELAYS = {
+    "nitter.net": 1.0,
+    "finance.yahoo.com": 1.5,
+    "marketwatch.com": 1.5,
+    "reddit.com": 1.5,
+}
@@ -1,87 +1,417 @@
 # core.py
-from data_collectors.company_info import CompanyInfoCollector
-from data_collectors.financial_data import FinancialDataCollector
-from data_collectors.news_collector import NewsCollector
-from data_collectors.social_media import SocialMediaCollector
-from data_collectors.competitor_info import CompetitorInfoCollector
-from analysis.sentiment import SentimentAnalyzer
-from analysis.trends import TrendsAnalyzer
-from storage.database import DatabaseManager
+from config import (RESEARCH_CONCURRENT, RESEARCH_MAX_WORKERS, RESEARCH_DEADLINE,
+                    RESEARCH_BACKGROUND_WORKERS, INCREMENTAL_REFRESH, SECTION_TTLS)
+from datetime import datetime
+from singleflight import SingleFlight
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, TimeoutError as FutureTimeoutError
+import copy
+import importlib
+import threading
 import time
 
+# Stage name -> stages whose output it needs. Listed in a valid sequential order.
+STAGE_DEPENDENCIES = {
+    "overview": (),
+    "ticker": (),
+    "financials": ("ticker",),
+    "news": (),
+    "sentiment": ("news",),
+    "social": (),
+    "competitors": (),
+    # Trends follow the overview's canonical company name, as they always have.
+    "trends": ("overview", "ticker"),
+}
+
+# Result section -> stages that produce it; the last one's output is the section.
+SECTION_STAGES = {
+    "overview": ("overview",),
+    "financials": ("financials",),
+    "recent_news": ("news", "sentiment"),
+    "social_media_sentiment": ("social",),
+    "competitors": ("competitors",),
+    "growth_trends": ("trends",),
+}
+
+# Short names accepted in `sections` requests.
+SECTION_ALIASES = {
+    "news": "recent_news",
+    "sentiment": "recent_news",
+    "social": "social_media_sentiment",
+    "trends": "growth_trends",
+}
+
+def normalize_sections(sections):
+    """Parse a section list ("a,b" or an iterable) into SECTION_STAGES order.
+
+    None or empty means every section; unknown names raise ValueError.
+    """
+    if not sections:
+        return list(SECTION_STAGES)
+    if isinstance(sections, str):
+        sections = sections.split(",")
+    requested = set()
+    for name in sections:
+        name = name.strip()
+        if not name:
+            continue
+        name = SECTION_ALIASES.get(name, name)
+        if name not in SECTION_STAGES:
+            raise ValueError(f"Unknown research section: {name}")
+        requested.add(name)
+    if not requested:
+        return list(SECTION_STAGES)
+    return [section for section in SECTION_STAGES if section in requested]
+
+def stages_for_sections(sections):
+    """Stages needed for `sections`, dependencies included, in STAGE_DEPENDENCIES order."""
+    needed = set()
+    todo = [stage for section in sections for stage in SECTION_STAGES[section]]
+    while todo:
+        stage = todo.pop()
+        if stage not in needed:
+            needed.add(stage)
+            todo.extend(STAGE_DEPENDENCIES[stage])
+    return [stage for stage in STAGE_DEPENDENCIES if stage in needed]
+
+# Shared by every engine in the process so identical concurrent requests run once.
+research_flights = SingleFlight()
+
+class ResearchBusy(Exception):
+    """Raised when every background research thread is taken."""
+
+class _BoundedExecutor:
+    # A thread pool that refuses work once all its threads are busy, instead
+    # of queueing it where it would wait out its caller's deadline.
+
+    def __init__(self, max_workers, thread_name_prefix):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._slots = threading.BoundedSemaphore(max_workers)
+
+    def submit(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise ResearchBusy("All background research threads are busy")
+
+        def run():
+            try:
+                return fn(*args)
+            finally:
+                self._slots.release()
+
+        try:
+            return self._executor.submit(run)
+        except Exception:
+            self._slots.release()
+            raise
+
+def research_key(company_name):
+    return " ".join(company_name.lower().split())
+
+def _component(name, module_name, class_name):
+    # Built on first access, once per engine, even when stages race for it.
+    # Each component has its own lock so a slow build does not hold up the others.
+    # The module is imported at that point too, which keeps pandas, yfinance,
+    # nltk and friends out of the import path of `core` and the web app.
+    lock = threading.Lock()
+
+    def get(self):
+        component = self._components.get(name)
+        if component is None:
+            with lock:
+                component = self._components.get(name)
+                if component is None:
+                    component = getattr(importlib.import_module(module_name), class_name)()
+                    self._components[name] = component
+        return component
+    return property(get)
+
 class ResearchEngine:
-    def __init__(self):
+    company_info = _component("company_info", "data_collectors.company_info", "CompanyInfoCollector")
+    financial_data = _component("financial_data", "data_collectors.financial_data", "FinancialDataCollector")
+    news_collector = _component("news_collector", "data_collectors.news_collector", "NewsCollector")
+    social_media = _component("social_media", "data_collectors.social_media", "SocialMediaCollector")
+    competitor_info = _component("competitor_info", "data_collectors.competitor_info", "CompetitorInfoCollector")
+
+    sentiment_analyzer = _component("sentiment_analyzer", "analysis.sentiment", "SentimentAnalyzer")
+    trends_analyzer = _component("trends_analyzer", "analysis.trends", "TrendsAnalyzer")
+
+    db = _component("db", "storage.database", "DatabaseManager")
+
+    def __init__(self, concurrent=RESEARCH_CONCURRENT, max_workers=RESEARCH_MAX_WORKERS,
+                 incremental=INCREMENTAL_REFRESH, section_ttls=SECTION_TTLS,
+                 background_workers=RESEARCH_BACKGROUND_WORKERS):
+        self._components = {}
+        self.incremental = incremental
+        self.section_ttls = section_ttls
+
+        self.concurrent = concurrent
+        self.max_workers = max_workers
+        # Runs research that has a deadline, so it can outlive the call that started it.
+        self.background = _BoundedExecutor(background_workers, "research-deadline")
+        self.stages = {
+            "overview": self._run_overview,
+            "ticker": self._run_ticker,
+            "financials": self._run_financials,
+            "news": self._run_news,
+            "sentiment": self._run_sentiment,
+            "social": self._run_social,
+            "competitors": self._run_competitors,
+            "trends": self._run_trends,
+        }
+
+    def research_company(self, company_name, progress_callback=None, sections=None, deadline=None):
+        """Research a company.
 
-        self.company_info = CompanyInfoCollector()
-        self.financial_data = FinancialDataCollector()
-        self.news_collector = NewsCollector()
-        self.social_media = SocialMediaCollector()
-        self.competitor_info = CompetitorInfoCollector()
-        
+        `sections` limits the result (and the collectors that run) to the named
+        sections; see normalize_sections. `progress_callback(stage, result,
+        completed, total)` is called as each stage finishes, including for
+        callers that joined an in-flight run.
 
-        self.sentiment_analyzer = SentimentAnalyzer()
-        self.trends_analyzer = TrendsAnalyzer()
-        
+        With a `deadline` (seconds; RESEARCH_DEADLINE when None, 0 for none)
+        the call returns after at most that long. If stages are still running
+        the result is marked "partial" and "section_status" says which sections
+        are "complete" and which are "late"; the late ones keep running and the
+        finished research is saved as usual, so the next call can reuse it.
+        Such runs use one of RESEARCH_BACKGROUND_WORKERS threads; when all are
+        busy a new run raises ResearchBusy, while calls that join a run already
+        in flight always succeed.
+        """
+        sections = normalize_sections(sections)
+        deadline = RESEARCH_DEADLINE if deadline is None else deadline
+        key = research_key(company_name)
+        if len(sections) < len(SECTION_STAGES):
+            key = f"{key}|{','.join(sections)}"
 
-        self.db = DatabaseManager()
+        if deadline:
+            return self._research_with_deadline(company_name, key, sections, deadline, progress_callback)
+
+        results, shared = research_flights.do(
+            key,
+            lambda emit: self._research_company(company_name, emit, sections),
+            listener=progress_callback
+        )
+        if shared:
+            print(f"Joined in-flight research for: {company_name}")
+            # Each caller gets its own copy so later mutations cannot leak between requests.
+            return copy.deepcopy(results)
+        return results
+
+    def _research_with_deadline(self, company_name, key, sections, deadline, progress_callback=None):
+        finished = {}
+        lock = threading.Lock()
+        expired = False
+
+        def on_stage(stage, result, completed, total):
+            with lock:
+                if expired:
+                    return
+                finished[stage] = result
+            if progress_callback:
+                progress_callback(stage, result, completed, total)
+
+        # A caller that arrives while the run is still going joins it instead of starting more.
+        future, shared = research_flights.start(
+            key,
+            lambda emit: self._research_company(company_name, emit, sections),
+            self.background,
+            listener=on_stage
+        )
+        try:
+            results = future.result(timeout=deadline)
+        except FutureTimeoutError:
+            with lock:
+                expired = True
+                # Only a section's last stage is copied; earlier ones may still be mutated.
+                done = {stage: copy.deepcopy(finished[stage])
+                        for stage in (SECTION_STAGES[section][-1] for section in sections)
+                        if stage in finished}
+            print(f"Research for {company_name} hit its {deadline:g}s deadline, returning partial results")
+            return self._partial_results(company_name, sections, done)
+        return copy.deepcopy(results) if shared else results
+
+    def _partial_results(self, company_name, sections, done):
+        research_results = {"company_name": company_name, "partial": True}
+        section_status = {}
+        for section in sections:
+            stage = SECTION_STAGES[section][-1]
+            research_results[section] = done.get(stage)
+            section_status[section] = "complete" if stage in done else "late"
+        research_results["section_status"] = section_status
+        return research_results
 
-    def research_company(self, company_name):
+    def _research_company(self, company_name, on_stage=None, sections=None):
 
         print(f"Starting research for: {company_name}")
+        started = time.time()
+        sections = sections or list(SECTION_STAGES)
 
+        previous = self._load_previous(company_name, sections) if self.incremental else None
+        reused = [section for section in self._fresh_sections(previous) if section in sections]
+        stale = [section for section in sections if section not in reused]
+        if reused:
+            print(f"Reusing fresh sections for {company_name}: {', '.join(reused)}")
+
+        # Reused sections are reported as already-finished stages so progress
+        # listeners still see every section.
+        stage_results = self._run_stages(
+            company_name,
+            stages_for_sections(stale),
+            on_stage,
+            done={SECTION_STAGES[section][-1]: previous[section] for section in reused}
+        )
+
+        now = datetime.now()
+        research_results = {"company_name": company_name}
+        section_timestamps = {}
+        for section in sections:
+            if section in reused:
+                research_results[section] = previous[section]
+                section_timestamps[section] = previous["section_timestamps"][section]
+            else:
+                research_results[section] = stage_results[SECTION_STAGES[section][-1]]
+                section_timestamps[section] = now
+        research_results["section_timestamps"] = section_timestamps
+        print(f"Research for {company_name} took {time.time() - started:.2f}s")
+
+        self.db.save_research(research_results, partial=len(sections) < len(SECTION_STAGES))
+        print(f"Research results saved for {company_name}")
+
+        return research_results
+
+    def _load_previous(self, company_name, sections):
+        try:
+            return self.db.get_research(company_name, sections=sections)
+        except Exception as e:
+            print(f"Error loading stored research: {e}")
+            return None
+
+    def _fresh_sections(self, previous):
+        """Sections of a stored result still within their TTL. Empty sections,
+        usually from a failed collector, are never reused."""
+        if not previous or not previous.get("section_timestamps"):
+            return []
+        now = datetime.now()
+        fresh = []
+        for section in SECTION_STAGES:
+            stored_at = previous["section_timestamps"].get(section)
+            ttl = self.section_ttls.get(section, 0)
+            if previous.get(section) and stored_at and (now - stored_at).total_seconds() < ttl:
+                fresh.append(section)
+        return fresh
+
+    def _run_stages(self, company_name, stage_names, on_stage=None, done=None):
+        """Run `stage_names`; `done` holds results of stages that need not run."""
+        results = {}
+        total = len(stage_names) + len(done or {})
+
+        def finish(name, result):
+            results[name] = result
+            if on_stage:
+                on_stage(name, result, len(results), total)
+
+        for name, result in (done or {}).items():
+            finish(name, result)
+
+        if not self.concurrent:
+            for name in stage_names:
+                finish(name, self.stages[name](company_name, results))
+            return results
+
+        if not stage_names:
+            return results
+
+        # A pool per call: concurrent researches never queue behind each other's stages.
+        pending = list(stage_names)
+        running = {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(stage_names)),
+                                thread_name_prefix="research") as executor:
+            while pending or running:
+                for name in list(pending):
+                    if all(dep in results for dep in STAGE_DEPENDENCIES[name]):
+                        pending.remove(name)
+                        future = executor.submit(self.stages[name], company_name, dict(results))
+                        running[future] = name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finish(running.pop(future), future.result())
+
+        return results
+
+    def warm_up(self):
+        """Build every component now instead of on the first request."""
+        for name in ("company_info", "financial_data", "news_collector", "social_media",
+                     "competitor_info", "sentiment_analyzer", "trends_analyzer", "db"):
+            getattr(self, name)
+        return self
+
+    def _run_overview(self, company_name, deps):
         print("Getting company overview...")
         try:
             overview = self.company_info.get_company_overview(company_name)
             if not overview:
                 print(f"No company overview found for {company_name}")
+            return overview
         except Exception as e:
             print(f"Error getting company overview: {e}")
-            overview = {}
+            return {}
+
+    def _run_ticker(self, company_name, deps):
+        try:
+            return self.financial_data._get_ticker_symbol(company_name)
+        except Exception as e:
+            print(f"Error resolving ticker symbol: {e}")
+            return None
 
+    def _run_financials(self, company_name, deps):
         print("Getting financial data...")
         try:
-            financials = self.financial_data.get_financial_data(company_name)
+            financials = self.financial_data.get_financial_data(company_name, ticker_symbol=deps["ticker"])
             if not financials:
                 print(f"No financial data found for {company_name}")
+            return financials
         except Exception as e:
             print(f"Error getting financial data: {e}")
-            financials = {}
+            return {}
 
+    def _run_news(self, company_name, deps):
         print("Getting recent news...")
         try:
             news = self.news_collector.get_recent_news(company_name)
             if not news:
                 print(f"No news found for {company_name}")
+            return news
         except Exception as e:
             print(f"Error getting news: {e}")
-            news = []
+            return []
 
+    def _run_sentiment(self, company_name, deps):
         print("Analyzing news sentiment...")
         try:
-            news_with_sentiment = self.sentiment_analyzer.analyze_news_sentiment(news)
+            return self.sentiment_analyzer.analyze_news_sentiment(deps["news"])
         except Exception as e:
             print(f"Error analyzing news sentiment: {e}")
-            news_with_sentiment = []
+            return []
+
+    def _run_social(self, company_name, deps):
         print("Getting social media sentiment...")
         try:
-            social_sentiment = self.social_media.get_social_media_sentiment(company_name)
+            return self.social_media.get_social_media_sentiment(company_name)
         except Exception as e:
             print(f"Error getting social media sentiment: {e}")
-            social_sentiment = {}
+            return {}
 
+    def _run_competitors(self, company_name, deps):
         print("Getting competitor information...")
         try:
-            competitors = self.competitor_info.get_competitors(company_name)
+            return self.competitor_info.get_competitors(company_name)
         except Exception as e:
             print(f"Error getting competitor information: {e}")
-            competitors = []
-        
+            return []
 
+    def _run_trends(self, company_name, deps):
         growth_trends = None
-        ticker_symbol = None
         try:
-            if overview.get('company_name'):
-                ticker_symbol = self.financial_data._get_ticker_symbol(overview['company_name'])
+            ticker_symbol = self._trends_ticker(company_name, deps)
             if ticker_symbol:
                 print("Analyzing growth trends...")
                 growth_trends = self.trends_analyzer.get_growth_trend(ticker_symbol)
@@ -92,18 +422,27 @@ class ResearchEngine:
                         growth_trends['forecast'] = forecast
         except Exception as e:
             print(f"Error analyzing growth trends: {e}")
+        return growth_trends
 
-        research_results = {
-            "company_name": company_name,
-            "overview": overview,
-            "financials": financials,
-            "recent_news": news_with_sentiment,
-            "social_media_sentiment": social_sentiment,
-            "competitors": competitors,
-            "growth_trends": growth_trends
-        }
-        
-        self.db.save_research(research_results)
-        print(f"Research results saved for {company_name}")
-        
-        return research_results
+    def _trends_ticker(self, company_name, deps):
+        # The ticker stage resolved the requested name; only look up again
+        # when the overview normalized it to something else.
+        canonical = (deps["overview"] or {}).get("company_name")
+        if not canonical:
+            return None
+        if canonical.strip().lower() == company_name.strip().lower():
+            return deps["ticker"]
+        return self.financial_data._get_ticker_symbol(canonical)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_research_engine():
+    """The process-wide engine; its components are shared by every request."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = ResearchEngine()
+    return _engine
@@ -1,8 +1,20 @@
-import requests
+from data_collectors.http_client import get_http_client
 from bs4 import BeautifulSoup
 import re
 import json
-from config import HEADERS
+from config import HEADERS, WIKIPEDIA_FAST_PARSE
+
+INFOBOX_FIELD_PATTERNS = [
+    ('headquarters', re.compile('Headquarters|Location')),
+    ('founded', re.compile('Founded|Established')),
+    ('industry', re.compile('Industry|Sector')),
+    ('ceo', re.compile('CEO|Chief Executive Officer|Key people|Leadership')),
+    ('employees', re.compile('Employees|Number of employees|Staff')),
+]
+TABLE_TAG_PATTERN = re.compile(r'<(/?)table\b[^>]*>', re.IGNORECASE)
+CLASS_ATTR_PATTERN = re.compile(r'\bclass\s*=\s*["\']([^"\']*)["\']', re.IGNORECASE)
+YEAR_PATTERN = re.compile(r'\b(?:19|20)\d{2}\b')
+NUMBER_PATTERN = re.compile(r'[\d,]+')
 
 class CompanyInfoCollector:
     def __init__(self):
@@ -27,43 +39,21 @@ class CompanyInfoCollector:
     def _get_from_wikipedia(self, company_name):
         try:
             search_url = f"https://en.wikipedia.org/wiki/{company_name.replace(' ', '_')}"
-            response = requests.get(search_url, headers=self.headers)
+            response = get_http_client().get(search_url, headers=self.headers)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                infobox = soup.find('table', {'class': 'infobox'})
+                infobox = None
+                if WIKIPEDIA_FAST_PARSE:
+                    # Parse only the infobox markup instead of the whole article.
+                    fragment = self._extract_infobox_html(response.text)
+                    if fragment:
+                        infobox = BeautifulSoup(fragment, 'html.parser').find('table')
+                else:
+                    soup = BeautifulSoup(response.text, 'html.parser')
+                    infobox = soup.find('table', {'class': 'infobox'})
                 
                 if infobox:
-                    info = {}
-                    
-                    hq_row = infobox.find('th', string=re.compile('Headquarters|Location'))
-                    if hq_row and hq_row.find_next('td'):
-                        info['headquarters'] = hq_row.find_next('td').text.strip()
-                    
-                    founded_row = infobox.find('th', string=re.compile('Founded|Established'))
-                    if founded_row and founded_row.find_next('td'):
-                        founded_text = founded_row.find_next('td').text.strip()
-                        years = re.findall(r'\b(?:19|20)\d{2}\b', founded_text)
-                        if years:
-                            info['founded'] = int(years[0])
-                    
-                    industry_row = infobox.find('th', string=re.compile('Industry|Sector'))
-                    if industry_row and industry_row.find_next('td'):
-                        info['industry'] = industry_row.find_next('td').text.strip()
-                    
-                    ceo_row = infobox.find('th', string=re.compile('CEO|Chief Executive Officer|Key people|Leadership'))
-                    if ceo_row and ceo_row.find_next('td'):
-                        ceo_text = ceo_row.find_next('td').text.strip()
-                        info['ceo'] = ceo_text.split(',')[0].strip()
-                    
-                    emp_row = infobox.find('th', string=re.compile('Employees|Number of employees|Staff'))
-                    if emp_row and emp_row.find_next('td'):
-                        emp_text = emp_row.find_next('td').text.strip()
-                        numbers = re.findall(r'[\d,]+', emp_text)
-                        if numbers:
-                            info['employees'] = numbers[0]
-                    
-                    return info
+                    return self._parse_infobox(infobox)
                 else:
                     return {}
             else:
@@ -71,4 +61,64 @@ class CompanyInfoCollector:
             
             return {}
         except Exception as e:
-            return {}
\ No newline at end of file
+            return {}
+
+    def _extract_infobox_html(self, html):
+        start = None
+        depth = 0
+        for match in TABLE_TAG_PATTERN.finditer(html):
+            closing = match.group(1) == '/'
+            if start is None:
+                if closing:
+                    continue
+                class_match = CLASS_ATTR_PATTERN.search(match.group(0))
+                if class_match and 'infobox' in class_match.group(1).split():
+                    start = match.start()
+                    depth = 1
+                continue
+            depth += -1 if closing else 1
+            if depth == 0:
+                return html[start:match.end()]
+        return html[start:] if start is not None else None
+
+    def _parse_infobox(self, infobox):
+        # One pass over the header cells; the first match per field wins, as with infobox.find().
+        rows = {}
+        for th in infobox.find_all('th'):
+            label = th.string
+            if label is None:
+                continue
+            for field, pattern in INFOBOX_FIELD_PATTERNS:
+                if field not in rows and pattern.search(label):
+                    rows[field] = th
+        
+        info = {}
+        
+        hq_row = rows.get('headquarters')
+        if hq_row and hq_row.find_next('td'):
+            info['headquarters'] = hq_row.find_next('td').text.strip()
+        
+        founded_row = rows.get('founded')
+        if founded_row and founded_row.find_next('td'):
+            founded_text = founded_row.find_next('td').text.strip()
+            years = YEAR_PATTERN.findall(founded_text)
+            if years:
+                info['founded'] = int(years[0])
+        
+        industry_row = rows.get('industry')
+        if industry_row and industry_row.find_next('td'):
+            info['industry'] = industry_row.find_next('td').text.strip()
+        
+        ceo_row = rows.get('ceo')
+        if ceo_row and ceo_row.find_next('td'):
+            ceo_text = ceo_row.find_next('td').text.strip()
+            info['ceo'] = ceo_text.split(',')[0].strip()
+        
+        emp_row = rows.get('employees')
+        if emp_row and emp_row.find_next('td'):
+            emp_text = emp_row.find_next('td').text.strip()
+            numbers = NUMBER_PATTERN.findall(emp_text)
+            if numbers:
+                info['employees'] = numbers[0]
+        
+        return info
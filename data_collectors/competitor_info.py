@@ -1,4 +1,5 @@
-import requests
+from data_collectors.http_client import get_http_client
+from data_collectors.rate_limiter import get_rate_limiter
 from config import HEADERS, CRUNCHBASE_API_KEY
 import yfinance as yf
 
@@ -35,7 +36,7 @@ class CompetitorInfoCollector:
                 "card_ids": "competitors",
                 "user_key": self.api_key
             }
-            response = requests.get(competitors_url, params=params)
+            response = get_http_client().get(competitors_url, params=params)
 
             if response.status_code == 200:
                 data = response.json()
@@ -59,7 +60,7 @@ class CompetitorInfoCollector:
                 "card_ids": "identifier",
                 "user_key": self.api_key
             }
-            response = requests.get(search_url, params=params)
+            response = get_http_client().get(search_url, params=params)
 
             if response.status_code == 200:
                 data = response.json()
@@ -86,7 +87,7 @@ class CompetitorInfoCollector:
                     "field_ids": "name,short_description,num_employees_enum,categories",
                     "user_key": self.api_key
                 }
-                response = requests.get(org_url, params=params)
+                response = get_http_client().get(org_url, params=params)
                 
                 if response.status_code == 200:
                     data = response.json()
@@ -102,6 +103,8 @@ class CompetitorInfoCollector:
                             result["industry"] = categories[0].get("name")
             
             try:
+                # yfinance does its own HTTP, so take a Yahoo token here.
+                get_rate_limiter().acquire("finance.yahoo.com")
                 ticker = yf.Ticker(competitor_name.replace(" ", ""))
                 info = ticker.info
                 if "marketCap" in info and info["marketCap"]:
@@ -3,15 +3,20 @@ import yfinance as yf
 from alpha_vantage.fundamentaldata import FundamentalData
 from alpha_vantage.timeseries import TimeSeries
 from config import ALPHA_VANTAGE_API_KEY
-import requests
+from data_collectors.http_client import get_http_client
+from data_collectors.rate_limiter import get_rate_limiter
+from data_collectors.symbol_index import get_symbol_index
 import re
 import time
 
+# Default for `ticker_symbol`: None is a real answer (no ticker found), not "look it up".
+UNRESOLVED = object()
+
 class FinancialDataCollector:
     def __init__(self):
         self.alpha_vantage_key = ALPHA_VANTAGE_API_KEY
     
-    def get_financial_data(self, company_name):
+    def get_financial_data(self, company_name, ticker_symbol=UNRESOLVED):
         result = {
             "market_cap": None,
             "stock_price": None,
@@ -19,7 +24,8 @@ class FinancialDataCollector:
             "funding_rounds": None
         }
         
-        ticker_symbol = self._get_ticker_symbol(company_name)
+        if ticker_symbol is UNRESOLVED:
+            ticker_symbol = self._get_ticker_symbol(company_name)
         
         if ticker_symbol:
             yahoo_data = self._get_yahoo_finance_data(ticker_symbol)
@@ -38,107 +44,45 @@ class FinancialDataCollector:
     def _get_ticker_symbol(self, company_name):
         try:
             company_name = company_name.strip().lower()
-            
-            ticker = yf.Ticker(company_name)
-            info = ticker.info
-            
-            if info and 'symbol' in info:
-                return info['symbol']
-            
-            search_url = f"https://finance.yahoo.com/lookup?s={company_name.replace(' ', '+')}"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'
-            }
-            response = requests.get(search_url, headers=headers)
-            
-            if response.status_code == 200:
-                matches = re.findall(r'data-symbol="([^"]+)"', response.text)
-                if matches:
-                    return matches[0]
-            
-            manual_mapping = {
-                "microsoft": "MSFT",
-                "apple": "AAPL",
-                "google": "GOOGL",
-                "amazon": "AMZN",
-                "tesla": "TSLA",
-                "facebook": "META",
-                "nvidia": "NVDA",
-                "netflix": "NFLX",
-                "alphabet": "GOOGL",
-                "meta": "META",
-                "intel": "INTC",
-                "ibm": "IBM",
-                "oracle": "ORCL",
-                "adobe": "ADBE",
-                "salesforce": "CRM",
-                "walmart": "WMT",
-                "disney": "DIS",
-                "coca cola": "KO",
-                "pepsico": "PEP",
-                "mcdonalds": "MCD",
-                "starbucks": "SBUX",
-                "nike": "NKE",
-                "ford": "F",
-                "general motors": "GM",
-                "boeing": "BA",
-                "lockheed martin": "LMT",
-                "exxon mobil": "XOM",
-                "chevron": "CVX",
-                "bp": "BP",
-                "shell": "SHEL",
-                "walt disney": "DIS",
-                "berkshire hathaway": "BRK-B",
-                "visa": "V",
-                "mastercard": "MA",
-                "paypal": "PYPL",
-                "square": "SQ",
-                "spotify": "SPOT",
-                "snap": "SNAP",
-                "twitter": "TWTR",
-                "uber": "UBER",
-                "lyft": "LYFT",
-                "airbnb": "ABNB",
-                "zoom": "ZM",
-                "peloton": "PTON",
-                "moderna": "MRNA",
-                "pfizer": "PFE",
-                "johnson & johnson": "JNJ",
-                "merck": "MRK",
-                "novartis": "NVS",
-                "roche": "RHHBY",
-                "astrazeneca": "AZN",
-                "biontech": "BNTX",
-                "gamestop": "GME",
-                "amc entertainment": "AMC",
-                "blackberry": "BB",
-                "nokia": "NOK",
-                "amd": "AMD",
-                "qualcomm": "QCOM",
-                "broadcom": "AVGO",
-                "texas instruments": "TXN",
-                "micrsoft": "MSFT",
-                "googl": "GOOGL",
-                "alphabet inc": "GOOGL",
-                "alphabet inc.": "GOOGL",
-                "alphabet class a": "GOOGL",
-                "alphabet class c": "GOOG",
-                "meta platforms": "META",
-                "meta platforms inc": "META",
-                "meta platforms inc.": "META",
-                "meta platforms class a": "META",
-            }
-            
-            if company_name in manual_mapping:
-                return manual_mapping[company_name]
-            
-            return None
+
+            symbol_index = get_symbol_index()
+            symbol = symbol_index.lookup(company_name)
+            if symbol:
+                return symbol
+
+            symbol = self._lookup_ticker_symbol_online(company_name)
+            if symbol:
+                symbol_index.add(company_name, symbol)
+            return symbol
         except Exception as e:
             print(f"Error getting ticker symbol: {e}")
             return None
+
+    def _lookup_ticker_symbol_online(self, company_name):
+        # yfinance does its own HTTP, so take a Yahoo token here.
+        get_rate_limiter().acquire("finance.yahoo.com")
+        ticker = yf.Ticker(company_name)
+        info = ticker.info
+
+        if info and 'symbol' in info:
+            return info['symbol']
+
+        search_url = f"https://finance.yahoo.com/lookup?s={company_name.replace(' ', '+')}"
+        headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'
+        }
+        response = get_http_client().get(search_url, headers=headers)
+
+        if response.status_code == 200:
+            matches = re.findall(r'data-symbol="([^"]+)"', response.text)
+            if matches:
+                return matches[0]
+
+        return None
     
     def _get_yahoo_finance_data(self, ticker_symbol):
         try:
+            get_rate_limiter().acquire("finance.yahoo.com")
             ticker = yf.Ticker(ticker_symbol)
             info = ticker.info
             
@@ -177,6 +121,8 @@ class FinancialDataCollector:
             
             result = {}
             
+            # The alpha_vantage client does its own HTTP, so take the host's tokens here.
+            get_rate_limiter().acquire("alphavantage.co")
             overview_data, _ = fd.get_company_overview(ticker_symbol)
             
             if 'MarketCapitalization' in overview_data and overview_data['MarketCapitalization']:
@@ -189,6 +135,7 @@ class FinancialDataCollector:
                     result['market_cap'] = f"${market_cap:,}"
             
             try:
+                get_rate_limiter().acquire("alphavantage.co")
                 price_data, _ = ts.get_quote_endpoint(ticker_symbol)
                 if '05. price' in price_data and price_data['05. price']:
                     result['stock_price'] = f"${float(price_data['05. price']):.2f}"
@@ -0,0 +1,266 @@
+# data_collectors/http_client.py
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, as_completed
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from data_collectors.response_cache import ResponseCache
+from data_collectors.rate_limiter import get_rate_limiter, RateLimitExceeded
+from data_collectors.circuit_breaker import CircuitBreakerRegistry, CircuitOpenError
+from config import (HTTP_TIMEOUT, HTTP_CONNECT_TIMEOUT, HTTP_SOURCE_TIMEOUTS, HTTP_POOL_SIZE,
+                    HTTP_MAX_RETRIES, HTTP_BACKOFF_FACTOR, HTTP_RETRY_MAX_WAIT, HTTP_CACHE_ENABLED,
+                    HTTP_HEDGING, HTTP_HEDGE_DELAYS)
+
+def _source_setting(settings, url, default=None):
+    # Settings are keyed by host and also apply to its subdomains.
+    host = urlsplit(url).hostname or ""
+    for source, value in settings.items():
+        if host == source or host.endswith("." + source):
+            return value
+    return default
+
+def _close_response(future):
+    # The losing half of a hedged pair still holds a pooled connection.
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+RETRY_METHODS = frozenset(["GET", "HEAD"])
+
+def _retry_after(response):
+    """Seconds the server asked us to wait, or None."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def _rate_limited_response(url, error):
+    # Stands in for the upstream's own 429 when our limiter refuses to wait.
+    response = requests.Response()
+    response.status_code = 429
+    response.reason = "Too Many Requests (client rate limit)"
+    response.url = url
+    response.headers["Retry-After"] = str(math.ceil(error.retry_after))
+    response._content = b""
+    return response
+
+# One keep-alive session shared by all collectors. The adapter keeps a connection
+# pool per host; pass any requests adapter as `transport` to stub out the network.
+# Every request gets a (connect, read) timeout for its host; with `breakers`, hosts
+# that keep failing are skipped until their circuit half-opens, and with
+# `hedge_delays`, slow GETs to those hosts are raced against a second attempt.
+# Idempotent requests that fail or get a 429/5xx are retried here rather than in
+# urllib3, so every attempt passes the breaker and the rate limiter, and no pause
+# is longer than `retry_max_wait`.
+class HttpClient:
+    def __init__(self, timeout=HTTP_TIMEOUT, pool_size=HTTP_POOL_SIZE,
+                 max_retries=HTTP_MAX_RETRIES, backoff_factor=HTTP_BACKOFF_FACTOR,
+                 transport=None, cache=None, rate_limiter=None,
+                 connect_timeout=HTTP_CONNECT_TIMEOUT, source_timeouts=HTTP_SOURCE_TIMEOUTS,
+                 breakers=None, hedge_delays=None, retry_max_wait=HTTP_RETRY_MAX_WAIT):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.retry_max_wait = retry_max_wait
+        self.connect_timeout = connect_timeout
+        self.source_timeouts = source_timeouts
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.breakers = breakers
+        self.hedge_delays = hedge_delays or {}
+        self._hedge_executor = (ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="http-hedge")
+                                if self.hedge_delays else None)
+
+        if transport is None:
+            transport = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+
+        self.session = requests.Session()
+        self.session.mount("https://", transport)
+        self.session.mount("http://", transport)
+
+    def timeout_for(self, url):
+        return _source_setting(self.source_timeouts, url, (self.connect_timeout, self.timeout))
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout_for(url))
+        if self.cache is None or method != "GET":
+            return self._send(method, url, **kwargs)
+        return self._cached_get(url, **kwargs)
+
+    def _send(self, method, url, **kwargs):
+        breaker = self.breakers.get(urlsplit(url).hostname) if self.breakers else None
+        retries = self.max_retries if method in RETRY_METHODS else 0
+
+        for attempt in range(retries + 1):
+            backoff = self.backoff_factor * 2 ** attempt
+            try:
+                response = self._attempt(method, url, breaker, **kwargs)
+            except RateLimitExceeded as e:
+                return _rate_limited_response(url, e)
+            except CircuitOpenError:
+                raise
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == retries or not self._may_retry(breaker, backoff):
+                    raise
+                time.sleep(backoff)
+                continue
+
+            if response.status_code not in RETRY_STATUSES or attempt == retries:
+                return response
+            wait_for = max(backoff, _retry_after(response) or 0)
+            if not self._may_retry(breaker, wait_for):
+                return response
+            response.close()
+            time.sleep(wait_for)
+
+    def _may_retry(self, breaker, wait_for):
+        # Waits past the cap would hold the caller beyond its source's deadline,
+        # and a host whose circuit has opened meanwhile is not worth another try.
+        return wait_for <= self.retry_max_wait and (breaker is None or breaker.state == "closed")
+
+    def _attempt(self, method, url, breaker, **kwargs):
+        if breaker and not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {urlsplit(url).hostname}, skipping {url}")
+
+        # Only requests the breaker lets through spend a token.
+        try:
+            self._throttle(url)
+        except RateLimitExceeded:
+            if breaker:
+                breaker.release()
+            raise
+
+        hedge_delay = _source_setting(self.hedge_delays, url) if method == "GET" else None
+        try:
+            if hedge_delay is not None:
+                response = self._hedged_request(method, url, hedge_delay, **kwargs)
+            else:
+                response = self.session.request(method, url, **kwargs)
+        except Exception:
+            if breaker:
+                breaker.record_failure()
+            raise
+
+        if breaker:
+            # Client errors (404, 429...) say nothing about the host's health.
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        return response
+
+    def _hedged_request(self, method, url, delay, **kwargs):
+        def attempt():
+            return self.session.request(method, url, **kwargs)
+
+        futures = [self._hedge_executor.submit(attempt)]
+        done, _ = wait(futures, timeout=delay)
+        if not done:
+            # A hedge that has to queue for a token would not beat the first attempt.
+            try:
+                self._throttle(url, max_wait=0)
+                futures.append(self._hedge_executor.submit(attempt))
+            except RateLimitExceeded:
+                pass
+
+        error = None
+        for future in as_completed(futures):
+            try:
+                response = future.result()
+            except Exception as e:
+                error = error or e
+                continue
+            for other in futures:
+                if other is not future:
+                    other.add_done_callback(_close_response)
+            return response
+        raise error
+
+    def _throttle(self, url, max_wait=None):
+        # Only requests that reach the network spend rate-limit tokens.
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(url, max_wait=max_wait)
+
+    def _cached_get(self, url, **kwargs):
+        cache = self.cache
+        key = cache.key(url, kwargs.get("params"))
+        entry = cache.get(key)
+
+        if entry is not None and (cache.offline or cache.is_fresh(entry)):
+            return cache.build_response(entry)
+        if cache.offline:
+            return cache.miss_response(url)
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry is not None:
+            headers.update(cache.conditional_headers(entry))
+        stream = kwargs.pop("stream", False)
+
+        try:
+            response = self._send("GET", url, headers=headers, stream=True, **kwargs)
+        except CircuitOpenError:
+            if entry is None:
+                raise
+            # The host is known to be down: a stale copy beats no answer.
+            return cache.build_response(entry)
+
+        if entry is not None and response.status_code == 304:
+            response.close()
+            return cache.build_response(cache.revalidated(key) or entry)
+
+        if response.status_code == 200:
+            cache.wrap(key, response)
+        if not stream:
+            # Reading the body here also completes the cache write.
+            response.content
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_http_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient(cache=ResponseCache() if HTTP_CACHE_ENABLED else None,
+                                     rate_limiter=get_rate_limiter(),
+                                     breakers=CircuitBreakerRegistry(),
+                                     hedge_delays=HTTP_HEDGE_DELAYS if HTTP_HEDGING else None)
+    return _client
+
+def circuit_states():
+    """Breaker state per host of the shared client, without creating one."""
+    client = _client
+    if client is None or client.breakers is None:
+        return {}
+    return client.breakers.states()
+
+def set_http_client(client):
+    """Swap the process-wide client (e.g. for a stub transport); returns the previous one."""
+    global _client
+    with _client_lock:
+        previous = _client
+        _client = client
+    return previous
@@ -1,10 +1,9 @@
 # data_collectors/news_collector.py
-import requests
+from data_collectors.http_client import get_http_client
 from bs4 import BeautifulSoup
 import json
 from datetime import datetime, timedelta
 from config import NEWS_API_KEY, HEADERS
-import time
 import random
 
 class NewsCollector:
@@ -58,7 +57,7 @@ class NewsCollector:
 
             url = f"https://newsapi.org/v2/everything?q={company_name} OR {company_name.lower()}&language=en&from={start_date_str}&to={end_date_str}&sortBy=publishedAt&apiKey={self.news_api_key}"
             
-            response = requests.get(url)
+            response = get_http_client().get(url)
             
             if response.status_code == 200:
                 data = response.json()
@@ -90,8 +89,7 @@ class NewsCollector:
             
             url = f"https://finance.yahoo.com/quote/{ticker}?p={ticker}"
             
-            time.sleep(1)  
-            response = requests.get(url, headers=self.headers)
+            response = get_http_client().get(url, headers=self.headers)
             
             if response.status_code == 200:
                 soup = BeautifulSoup(response.text, 'html.parser')
@@ -143,8 +141,7 @@ class NewsCollector:
         try:
             url = f"https://www.marketwatch.com/search?q={company_name}&m=Keyword&rpp=15&mp=0&bd=false&rs=true"
             
-            time.sleep(1)  # Prevent rate limiting
-            response = requests.get(url, headers=self.headers)
+            response = get_http_client().get(url, headers=self.headers)
             
             if response.status_code == 200:
                 soup = BeautifulSoup(response.text, 'html.parser')
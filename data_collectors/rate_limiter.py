@@ -0,0 +1,82 @@
+# data_collectors/rate_limiter.py
+import threading
+import time
+from urllib.parse import urlsplit
+from config import RATE_LIMITS, RATE_LIMIT_MAX_WAIT
+
+class RateLimitExceeded(Exception):
+    """Raised when a token would not be available within the caller's max wait."""
+
+    def __init__(self, message, retry_after):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, at most `capacity` banked.
+
+    acquire() reserves a token and sleeps only for as long as the bucket is in
+    debt, so callers are served in arrival order without polling. With
+    `max_wait`, a caller that would wait longer gives its token back and gets
+    RateLimitExceeded instead, which also keeps the debt bounded.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait=None):
+        """Take one token, waiting if the bucket is empty; returns the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+            if max_wait is not None and wait > max_wait:
+                self._tokens += 1
+                raise RateLimitExceeded(f"No token within {max_wait}s (next in {wait:.1f}s)", wait)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """One token bucket per configured upstream host, shared process-wide.
+
+    `limits` maps a host (matching subdomains too) to (requests per second, burst).
+    Hosts without a limit pass straight through. Callers wait at most `max_wait`
+    seconds for a token unless they pass their own bound.
+    """
+
+    def __init__(self, limits=RATE_LIMITS, max_wait=RATE_LIMIT_MAX_WAIT):
+        self._buckets = {host: TokenBucket(rate, burst) for host, (rate, burst) in limits.items()}
+        self.max_wait = max_wait
+
+    def bucket_for(self, host):
+        host = host or ""
+        for source, bucket in self._buckets.items():
+            if host == source or host.endswith("." + source):
+                return bucket
+        return None
+
+    def acquire(self, url_or_host, max_wait=None):
+        host = urlsplit(url_or_host).hostname if "//" in url_or_host else url_or_host
+        bucket = self.bucket_for(host)
+        if bucket is None:
+            return 0
+        return bucket.acquire(self.max_wait if max_wait is None else max_wait)
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+def get_rate_limiter():
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = HostRateLimiter()
+    return _limiter
@@ -0,0 +1,257 @@
+# data_collectors/response_cache.py
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from urllib.parse import urlencode, urlsplit, urlunsplit, parse_qsl
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from config import (HTTP_CACHE_DIR, HTTP_CACHE_MAX_BYTES, HTTP_CACHE_DEFAULT_TTL,
+                    HTTP_CACHE_TTLS, HTTP_CACHE_OFFLINE, HTTP_CACHE_SECRET_PARAMS)
+
+# Response headers worth replaying. Bodies are stored decoded, so
+# Content-Encoding / Content-Length are deliberately dropped.
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Date", "Cache-Control")
+
+def redact_url(url, params=None):
+    """`url` with `params` merged into its query and credential parameters removed."""
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        query += sorted(params.items()) if isinstance(params, dict) else list(params)
+    query = [(name, value) for name, value in query if name.lower() not in HTTP_CACHE_SECRET_PARAMS]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query, doseq=True), ""))
+
+class ResponseCache:
+    """On-disk cache of successful GET responses.
+
+    Entries (one small JSON file per request) point at content-addressed body
+    blobs, so identical payloads are stored once. Each upstream host has its own
+    TTL; stale entries are revalidated with ETag / Last-Modified. When the blobs
+    exceed `max_bytes` the least recently used entries are evicted. In offline
+    mode every lookup is served from disk, whatever its age.
+    """
+
+    def __init__(self, directory=HTTP_CACHE_DIR, max_bytes=HTTP_CACHE_MAX_BYTES,
+                 default_ttl=HTTP_CACHE_DEFAULT_TTL, source_ttls=HTTP_CACHE_TTLS,
+                 offline=HTTP_CACHE_OFFLINE):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.source_ttls = source_ttls
+        self.offline = offline
+
+        self._entries_dir = os.path.join(directory, "entries")
+        self._blobs_dir = os.path.join(directory, "blobs")
+        self._tmp_dir = os.path.join(directory, "tmp")
+        for path in (self._entries_dir, self._blobs_dir, self._tmp_dir):
+            os.makedirs(path, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._last_access = {}
+        self._blob_refs = {}
+        self._blob_sizes = {}
+        self._total_bytes = 0
+        self._load_index()
+
+    def _load_index(self):
+        for name in os.listdir(self._entries_dir):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self._entries_dir, name)) as f:
+                    entry = json.load(f)
+                if not os.path.exists(self._blob_path(entry["body_hash"])):
+                    continue
+                if entry["url"] != redact_url(entry["url"]):
+                    # Written before URLs were redacted; it holds a credential.
+                    os.remove(os.path.join(self._entries_dir, name))
+                    continue
+                self._index_entry(name[:-5], entry)
+                self._last_access[name[:-5]] = entry["stored_at"]
+            except Exception as e:
+                print(f"Skipping unreadable cache entry {name}: {e}")
+
+    @staticmethod
+    def key(url, params=None):
+        # Requests differing only in credentials share an entry.
+        return hashlib.sha256(redact_url(url, params).encode("utf-8")).hexdigest()
+
+    def ttl_for(self, url):
+        host = urlsplit(url).hostname or ""
+        for source, ttl in self.source_ttls.items():
+            if host == source or host.endswith("." + source):
+                return ttl
+        return self.default_ttl
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._last_access[key] = time.time()
+            return entry
+
+    def is_fresh(self, entry):
+        return time.time() - entry["stored_at"] < self.ttl_for(entry["url"])
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry["headers"].get("ETag"):
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if entry["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        return headers
+
+    def build_response(self, entry, request=None):
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = "OK"
+        response.url = entry["url"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.request = request
+        # Served straight from the blob file, so streaming readers never load it whole.
+        response.raw = open(self._blob_path(entry["body_hash"]), "rb")
+        return response
+
+    def miss_response(self, url, request=None):
+        response = requests.Response()
+        response.status_code = 504
+        response.reason = "Not cached (offline mode)"
+        response.url = url
+        response.request = request
+        response._content = b""
+        return response
+
+    def revalidated(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry = dict(entry, stored_at=time.time())
+            self._entries[key] = entry
+        self._write_entry(key, entry)
+        return entry
+
+    def wrap(self, key, response):
+        """Tee the body of a live response into the cache as it is read."""
+        headers = {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers}
+        entry = {"url": redact_url(response.url), "status": response.status_code, "headers": headers}
+        response.raw = _CachingRaw(response.raw, self, key, entry)
+        return response
+
+    def store(self, key, entry, tmp_path, body_hash, size):
+        blob_path = self._blob_path(body_hash)
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        if os.path.exists(blob_path):
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, blob_path)
+
+        entry = dict(entry, body_hash=body_hash, size=size, stored_at=time.time())
+        self._write_entry(key, entry)
+        with self._lock:
+            replaced_hash = self._drop_entry(key)
+            self._index_entry(key, entry)
+            self._last_access[key] = entry["stored_at"]
+            evicted = self._evict()
+            if replaced_hash and replaced_hash not in self._blob_refs:
+                self._remove_files(None, replaced_hash)
+        for evicted_key, orphan_hash in evicted:
+            self._remove_files(evicted_key, orphan_hash)
+
+    def new_tmp_path(self):
+        return os.path.join(self._tmp_dir, uuid.uuid4().hex)
+
+    def _index_entry(self, key, entry):
+        body_hash = entry["body_hash"]
+        self._entries[key] = entry
+        self._blob_refs[body_hash] = self._blob_refs.get(body_hash, 0) + 1
+        if body_hash not in self._blob_sizes:
+            self._blob_sizes[body_hash] = entry["size"]
+            self._total_bytes += entry["size"]
+
+    def _drop_entry(self, key):
+        """Unindex an entry; returns the blob hash if nothing references it any more."""
+        entry = self._entries.pop(key, None)
+        self._last_access.pop(key, None)
+        if entry is None:
+            return None
+        body_hash = entry["body_hash"]
+        self._blob_refs[body_hash] -= 1
+        if self._blob_refs[body_hash] > 0:
+            return None
+        del self._blob_refs[body_hash]
+        self._total_bytes -= self._blob_sizes.pop(body_hash, 0)
+        return body_hash
+
+    def _evict(self):
+        evicted = []
+        if self._total_bytes <= self.max_bytes:
+            return evicted
+        for key in sorted(self._last_access, key=self._last_access.get):
+            if self._total_bytes <= self.max_bytes:
+                break
+            evicted.append((key, self._drop_entry(key)))
+        return evicted
+
+    def _remove_files(self, key, orphan_hash):
+        for path in (self._entry_path(key) if key else None, self._blob_path(orphan_hash) if orphan_hash else None):
+            if path and os.path.exists(path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _write_entry(self, key, entry):
+        tmp_path = self.new_tmp_path()
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self._entry_path(key))
+
+    def _entry_path(self, key):
+        return os.path.join(self._entries_dir, f"{key}.json")
+
+    def _blob_path(self, body_hash):
+        return os.path.join(self._blobs_dir, body_hash[:2], body_hash)
+
+
+class _CachingRaw:
+    # Wraps urllib3's raw response: decoded chunks handed to requests'
+    # iter_content are also written to a temp file, which becomes a cache
+    # entry only if the body was read to the end.
+
+    def __init__(self, raw, cache, key, entry):
+        self._raw = raw
+        self._cache = cache
+        self._key = key
+        self._entry = entry
+
+    def stream(self, amt=2 ** 16, decode_content=None):
+        tmp_path = self._cache.new_tmp_path()
+        digest = hashlib.sha256()
+        size = 0
+        complete = False
+        try:
+            with open(tmp_path, "wb") as f:
+                for chunk in self._raw.stream(amt, decode_content=decode_content):
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+                    yield chunk
+            complete = True
+        finally:
+            if complete:
+                try:
+                    self._cache.store(self._key, self._entry, tmp_path, digest.hexdigest(), size)
+                except Exception as e:
+                    print(f"Error writing HTTP cache entry: {e}")
+            elif os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
@@ -1,19 +1,52 @@
 # data_collectors/social_media.py
-import requests
+from data_collectors.http_client import get_http_client
 from bs4 import BeautifulSoup
-import re
 from datetime import datetime
 from config import HEADERS
 import time
 import json
-from config import HEADERS, TWITTER_API_KEY, TWITTER_API_SECRET
+import threading
+from config import HEADERS, TWITTER_API_KEY, TWITTER_API_SECRET, TWITTER_TOKEN_TTL, TWITTER_TOKEN_RETRY
+from analysis.keyword_sentiment import KeywordSentimentScorer
+
+TWEET_SCORER = KeywordSentimentScorer(
+    ['good', 'great', 'excellent', 'amazing', 'positive', 'bull', 'bullish', 'up', 'higher', 'rise', 'profit'],
+    ['bad', 'terrible', 'awful', 'negative', 'poor', 'bear', 'bearish', 'down', 'lower', 'fall', 'loss']
+)
+PAGE_SCORER = KeywordSentimentScorer(
+    ['good', 'great', 'excellent', 'amazing', 'positive', 'bull', 'bullish'],
+    ['bad', 'terrible', 'awful', 'negative', 'poor', 'bear', 'bearish']
+)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Bearer tokens shared by every collector: api key -> (token or None, expires_at).
+# Failed fetches are remembered too, so a missing token is not re-requested per call.
+_bearer_tokens = {}
+_bearer_lock = threading.Lock()
 
 class SocialMediaCollector:
     def __init__(self):
         self.headers = HEADERS
         self.twitter_api_key = TWITTER_API_KEY
         self.twitter_api_secret = TWITTER_API_SECRET
-        self.twitter_bearer_token = self._get_twitter_bearer_token()
+    
+    @property
+    def twitter_bearer_token(self):
+        """Fetched on first use and reused until it expires."""
+        if not self.twitter_api_key or not self.twitter_api_secret:
+            return None
+        
+        with _bearer_lock:
+            cached = _bearer_tokens.get(self.twitter_api_key)
+            if cached and cached[1] > time.time():
+                return cached[0]
+            token, ttl = self._get_twitter_bearer_token()
+            _bearer_tokens[self.twitter_api_key] = (token, time.time() + ttl)
+            return token
+    
+    def _invalidate_twitter_bearer_token(self):
+        with _bearer_lock:
+            _bearer_tokens.pop(self.twitter_api_key, None)
     
     def get_social_media_sentiment(self, company_name):
         result = {
@@ -32,9 +65,7 @@ class SocialMediaCollector:
         return result
     
     def _get_twitter_bearer_token(self):
-        if not self.twitter_api_key or not self.twitter_api_secret:
-            return None
-            
+        """Return (token, seconds to keep it); token is None if the fetch failed."""
         try:
             auth_url = "https://api.twitter.com/oauth2/token"
             auth_headers = {
@@ -45,15 +76,16 @@ class SocialMediaCollector:
                 "grant_type": "client_credentials"
             }
             
-            response = requests.post(auth_url, headers=auth_headers, data=auth_data)
+            response = get_http_client().post(auth_url, headers=auth_headers, data=auth_data)
             if response.status_code == 200:
-                return response.json().get("access_token")
+                data = response.json()
+                return data.get("access_token"), int(data.get("expires_in", TWITTER_TOKEN_TTL))
             else:
                 print(f"Failed to get Twitter bearer token: {response.status_code}")
-                return None
+                return None, TWITTER_TOKEN_RETRY
         except Exception as e:
             print(f"Error getting Twitter bearer token: {e}")
-            return None
+            return None, TWITTER_TOKEN_RETRY
     
     def _get_base64_encoded_credentials(self):
         import base64
@@ -62,19 +94,20 @@ class SocialMediaCollector:
     
     def _get_twitter_sentiment(self, company_name):
         try:
-            if (self.twitter_bearer_token):
-                return self._get_twitter_api_sentiment(company_name)
+            bearer_token = self.twitter_bearer_token
+            if (bearer_token):
+                return self._get_twitter_api_sentiment(company_name, bearer_token)
             else:
                 return self._get_twitter_scrape_sentiment(company_name)
         except Exception as e:
             print(f"Error fetching Twitter sentiment: {e}")
             return None
     
-    def _get_twitter_api_sentiment(self, company_name):
+    def _get_twitter_api_sentiment(self, company_name, bearer_token):
         try:
             search_url = "https://api.twitter.com/2/tweets/search/recent"
             search_headers = {
-                "Authorization": f"Bearer {self.twitter_bearer_token}"
+                "Authorization": f"Bearer {bearer_token}"
             }
             search_params = {
                 "query": f"{company_name} -is:retweet -is:reply",
@@ -82,7 +115,7 @@ class SocialMediaCollector:
                 "tweet.fields": "public_metrics,created_at"
             }
             
-            response = requests.get(search_url, headers=search_headers, params=search_params)
+            response = get_http_client().get(search_url, headers=search_headers, params=search_params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -91,23 +124,19 @@ class SocialMediaCollector:
                 if not tweets:
                     return "Neutral"
                 
-                positive_words = ['good', 'great', 'excellent', 'amazing', 'positive', 'bull', 'bullish', 'up', 'higher', 'rise', 'profit']
-                negative_words = ['bad', 'terrible', 'awful', 'negative', 'poor', 'bear', 'bearish', 'down', 'lower', 'fall', 'loss']
-                
                 positive_count = 0
                 negative_count = 0
                 
                 for tweet in tweets:
-                    text = tweet.get("text", "").lower()
-                    positive_count += sum(1 for word in positive_words if word in text)
-                    negative_count += sum(1 for word in negative_words if word in text)
+                    tweet_positive, tweet_negative = TWEET_SCORER.count(tweet.get("text", ""))
+                    positive_count += tweet_positive
+                    negative_count += tweet_negative
                 
-                if positive_count > negative_count * 1.5:
-                    return "Positive"
-                elif negative_count > positive_count * 1.5:
-                    return "Negative"
-                else:
-                    return "Neutral"
+                return TWEET_SCORER.label(positive_count, negative_count)
+            elif response.status_code == 401:
+                print("Twitter bearer token rejected, fetching a new one next time")
+                self._invalidate_twitter_bearer_token()
+                return None
             else:
                 print(f"Twitter API error: {response.status_code}")
                 return None
@@ -118,19 +147,12 @@ class SocialMediaCollector:
     def _get_twitter_scrape_sentiment(self, company_name):
         try:
             url = f"https://nitter.net/search?f=tweets&q={company_name}&since=&until=&near="
-            response = requests.get(url, headers=self.headers)
+            response = get_http_client().get(url, headers=self.headers, stream=True)
             
             if response.status_code == 200:
-                positive_count = len(re.findall(r'good|great|excellent|amazing|positive|bull|bullish', response.text, re.IGNORECASE))
-                negative_count = len(re.findall(r'bad|terrible|awful|negative|poor|bear|bearish', response.text, re.IGNORECASE))
-                
-                if positive_count > negative_count * 1.5:
-                    return "Positive"
-                elif negative_count > positive_count * 1.5:
-                    return "Negative"
-                else:
-                    return "Neutral"
+                return self._score_page(response)
             
+            response.close()
             return "Neutral"
         except Exception as e:
             print(f"Error with Twitter scrape sentiment: {e}")
@@ -140,20 +162,20 @@ class SocialMediaCollector:
         try:
             url = f"https://www.reddit.com/search/?q={company_name}&sort=top&t=month"
             
-            response = requests.get(url, headers=self.headers)
+            response = get_http_client().get(url, headers=self.headers, stream=True)
             
             if response.status_code == 200:
-                positive_count = len(re.findall(r'good|great|excellent|amazing|positive|bull|bullish', response.text, re.IGNORECASE))
-                negative_count = len(re.findall(r'bad|terrible|awful|negative|poor|bear|bearish', response.text, re.IGNORECASE))
-                
-                if positive_count > negative_count * 1.5:
-                    return "Positive"
-                elif negative_count > positive_count * 1.5:
-                    return "Negative"
-                else:
-                    return "Neutral"
+                return self._score_page(response)
             
+            response.close()
             return None
         except Exception as e:
             print(f"Error fetching Reddit sentiment: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def _score_page(self, response):
+        try:
+            positive_count, negative_count = PAGE_SCORER.count_stream(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+        finally:
+            response.close()
+        return PAGE_SCORER.label(positive_count, negative_count)
@@ -0,0 +1,146 @@
+# data_collectors/symbol_index.py
+import csv
+import re
+import threading
+from config import SYMBOL_LISTING_PATH, SYMBOL_FUZZY_THRESHOLD, SYMBOL_FUZZY_MARGIN
+
+LEGAL_SUFFIXES = {
+    "inc", "incorporated", "corp", "corporation", "co", "company", "ltd", "limited",
+    "plc", "llc", "lp", "holding", "holdings", "group", "sa", "se", "ag", "nv", "oyj",
+    "com", "and", "&",
+}
+
+MIN_FUZZY_LENGTH = 4
+
+def normalize_company_name(name):
+    name = name.lower().strip()
+    name = re.sub(r"['’.]", "", name)
+    name = re.sub(r"[^a-z0-9&]+", " ", name)
+    return " ".join(name.split())
+
+def strip_legal_suffixes(normalized_name):
+    tokens = normalized_name.split()
+    if len(tokens) > 1 and tokens[0] == "the":
+        tokens = tokens[1:]
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens = tokens[:-1]
+    return " ".join(tokens)
+
+def _trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class SymbolIndex:
+    def __init__(self, listing_path=None):
+        self._exact = {}
+        self._keys = []
+        self._key_symbols = []
+        self._key_sizes = []
+        self._postings = {}
+        self._lock = threading.Lock()
+
+        if listing_path:
+            self.load(listing_path)
+
+    def load(self, listing_path):
+        try:
+            with open(listing_path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    symbol = row.get("symbol", "").strip()
+                    if not symbol:
+                        continue
+                    names = [row.get("name", "")] + (row.get("aliases") or "").split("|")
+                    self.add_names(symbol, names)
+                    self._add_key(symbol.lower(), symbol, fuzzy=False)
+        except Exception as e:
+            print(f"Error loading symbol listing {listing_path}: {e}")
+
+    def add(self, company_name, symbol):
+        with self._lock:
+            self.add_names(symbol, [company_name])
+
+    def add_names(self, symbol, names):
+        for name in names:
+            normalized = normalize_company_name(name)
+            if not normalized:
+                continue
+            self._add_key(normalized, symbol)
+            self._add_key(strip_legal_suffixes(normalized), symbol)
+
+    def _add_key(self, key, symbol, fuzzy=True):
+        if key in self._exact:
+            return
+        self._exact[key] = symbol
+
+        if fuzzy:
+            key_id = len(self._keys)
+            grams = _trigrams(key)
+            self._keys.append(key)
+            self._key_symbols.append(symbol)
+            self._key_sizes.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(key_id)
+
+    def lookup(self, company_name, fuzzy=True):
+        normalized = normalize_company_name(company_name)
+        if not normalized:
+            return None
+
+        symbol = self._exact.get(normalized)
+        if symbol is None:
+            symbol = self._exact.get(strip_legal_suffixes(normalized))
+        if symbol is not None or not fuzzy:
+            return symbol
+
+        return self._fuzzy_lookup(strip_legal_suffixes(normalized))
+
+    def _fuzzy_lookup(self, key, threshold=SYMBOL_FUZZY_THRESHOLD, margin=SYMBOL_FUZZY_MARGIN):
+        """Trigram Dice match, accepted only when it is unambiguous.
+
+        The best key must share the query's first token, score at least
+        `threshold`, and beat the best key of any other symbol by `margin`.
+        Anything less returns None so the caller falls back to the online
+        lookup instead of guessing (e.g. "Applebee's" is not Apple).
+        """
+        if len(key) < MIN_FUZZY_LENGTH:
+            return None
+
+        grams = _trigrams(key)
+        shared = {}
+        for gram in grams:
+            for key_id in self._postings.get(gram, ()):
+                shared[key_id] = shared.get(key_id, 0) + 1
+
+        # Best score per symbol, so aliases of one company do not compete with each other.
+        best_by_symbol = {}
+        for key_id, count in shared.items():
+            score = 2.0 * count / (len(grams) + self._key_sizes[key_id])
+            symbol = self._key_symbols[key_id]
+            if score > best_by_symbol.get(symbol, (0.0, None))[0]:
+                best_by_symbol[symbol] = (score, key_id)
+        if not best_by_symbol:
+            return None
+
+        ranked = sorted(best_by_symbol.items(), key=lambda item: item[1][0], reverse=True)
+        symbol, (best_score, best_id) = ranked[0]
+        runner_up = ranked[1][1][0] if len(ranked) > 1 else 0.0
+        if best_score < threshold or best_score - runner_up < margin:
+            return None
+        if key.split()[0] != self._keys[best_id].split()[0]:
+            return None
+        return symbol
+
+    def __len__(self):
+        return len(self._exact)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_symbol_index():
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SymbolIndex(SYMBOL_LISTING_PATH)
+    return _index
@@ -0,0 +1,51 @@
+# scripts/benchmark_startup.py
+"""Measure cold-start time in fresh interpreters: importing the web app, and
+building a warm ResearchEngine (every collector and analyzer constructed).
+
+    python scripts/benchmark_startup.py [--runs 5] [--max-seconds 1.0]
+
+With --max-seconds the script exits non-zero when the median app import is
+slower, so it can run as a regression check.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    "import app": "import app",
+    "import + warm engine": "import app; from core import get_research_engine; get_research_engine().warm_up()",
+}
+
+def time_scenario(code, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=None,
+                        help="fail if the median 'import app' time exceeds this")
+    args = parser.parse_args()
+
+    medians = {}
+    for name, code in SCENARIOS.items():
+        timings = time_scenario(code, args.runs)
+        medians[name] = statistics.median(timings)
+        print(f"{name:<22} median {medians[name]:.3f}s  min {min(timings):.3f}s  max {max(timings):.3f}s")
+
+    if args.max_seconds is not None and medians["import app"] > args.max_seconds:
+        print(f"Startup regression: 'import app' took {medians['import app']:.3f}s (limit {args.max_seconds:.3f}s)")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# scripts/build_sentiment_lexicon.py
+"""Build data/sentiment_lexicon.json: NLTK's VADER lexicon merged with the
+financial terms from analysis.sentiment, so the app never parses or
+downloads the NLTK data at runtime.
+
+    python scripts/build_sentiment_lexicon.py [--output PATH]
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import nltk
+from nltk.sentiment.vader import SentimentIntensityAnalyzer
+from analysis.sentiment import FINANCIAL_LEXICON
+from config import SENTIMENT_LEXICON_PATH
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default=SENTIMENT_LEXICON_PATH)
+    args = parser.parse_args()
+
+    try:
+        nltk.data.find("sentiment/vader_lexicon.zip")
+    except LookupError:
+        nltk.download("vader_lexicon")
+
+    lexicon = SentimentIntensityAnalyzer().lexicon
+    lexicon.update({term: score for term, score in FINANCIAL_LEXICON.items() if " " not in term})
+
+    artifact = {
+        "source": "nltk vader_lexicon + analysis.sentiment.FINANCIAL_LEXICON",
+        "nltk_version": nltk.__version__,
+        "lexicon": dict(sorted(lexicon.items())),
+    }
+    tmp_path = args.output + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(artifact, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, args.output)
+    print(f"Wrote {len(lexicon)} terms to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# singleflight.py
+import threading
+from concurrent.futures import Future
+
+class _Flight:
+    def __init__(self):
+        self.future = Future()
+        self.events = []
+        self.listeners = []
+        self.lock = threading.Lock()
+
+    def subscribe(self, listener):
+        # Late joiners first get every event emitted so far, then live ones.
+        with self.lock:
+            for args in self.events:
+                listener(*args)
+            self.listeners.append(listener)
+
+    def emit(self, *args):
+        with self.lock:
+            self.events.append(args)
+            for listener in self.listeners:
+                try:
+                    listener(*args)
+                except Exception as e:
+                    print(f"Progress listener failed: {e}")
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key: the first caller runs the
+    function and every caller that arrives while it runs waits on the same future.
+
+    The function receives an `emit` callable; whatever it emits is forwarded to
+    the `listener` of every caller sharing the flight.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, listener=None):
+        """Return (result, shared); `shared` is True for callers that joined an in-flight call."""
+        flight, leader = self._join(key, listener)
+        if leader:
+            self._run(key, flight, fn)
+        return flight.future.result(), not leader
+
+    def start(self, key, fn, executor, listener=None):
+        """Like do(), but return (future, shared) at once.
+
+        A new flight is submitted to `executor`; joiners just get its future, so
+        there is never more than one run per key however many callers give up
+        waiting on it. If the executor refuses the work, its error is raised here
+        and the flight is dropped.
+        """
+        flight, leader = self._join(key, listener)
+        if leader:
+            try:
+                executor.submit(self._run, key, flight, fn)
+            except BaseException as e:
+                flight.future.set_exception(e)
+                with self._lock:
+                    del self._flights[key]
+                raise
+        return flight.future, not leader
+
+    def _join(self, key, listener):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+
+        if listener is not None:
+            flight.subscribe(listener)
+        return flight, leader
+
+    def _run(self, key, flight, fn):
+        # The outcome, error included, reaches every caller through the future.
+        try:
+            flight.future.set_result(fn(flight.emit))
+        except BaseException as e:
+            flight.future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+    def in_flight(self):
+        with self._lock:
+            return list(self._flights)
@@ -1,12 +1,157 @@
 # storage/database.py
 import pymongo
+import atexit
+import hashlib
+import json
+import queue
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
-from config import MONGO_URI, MONGO_DB
+from config import (MONGO_URI, MONGO_DB, MONGO_TIMEOUT_MS, DB_WRITE_BEHIND, DB_WRITE_QUEUE_SIZE,
+                    DB_WRITE_BATCH_SIZE, DB_FLUSH_INTERVAL, SNAPSHOT_HASH_CACHE_SIZE)
+
+# Keys of a research result that are metadata rather than snapshot sections.
+SNAPSHOT_META_KEYS = ("_id", "company_name", "timestamp", "section_timestamps")
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_mongo_client():
+    """One MongoClient (and its connection pool) per process; it is thread-safe."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = pymongo.MongoClient(MONGO_URI, serverSelectionTimeoutMS=MONGO_TIMEOUT_MS)
+    return _client
+
+def ensure_indexes(db):
+    # Covers get_research's company_name filter with its newest-first sort.
+    db.research.create_index([("company_name", pymongo.ASCENDING), ("timestamp", pymongo.DESCENDING)])
+    db.research.create_index([("timestamp", pymongo.DESCENDING)])
+    db.research_snapshots.create_index([("company_name", pymongo.ASCENDING), ("timestamp", pymongo.DESCENDING)])
+
+def section_hash(data):
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+class WriteBehindQueue:
+    """Bounded queue of write operations flushed by a background thread.
+
+    Operations are (collection name, pymongo write op) pairs. The flusher waits
+    up to `flush_interval` seconds to gather up to `batch_size` operations and
+    sends them with one bulk_write per collection. When the queue is full,
+    put() writes synchronously instead of dropping the operation.
+    """
+
+    def __init__(self, db, max_size=DB_WRITE_QUEUE_SIZE, batch_size=DB_WRITE_BATCH_SIZE,
+                 flush_interval=DB_FLUSH_INTERVAL):
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_size)
+        self._closed = False
+        self.failures = 0
+        self._thread = threading.Thread(target=self._run, name="db-write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def put(self, collection_name, operation):
+        if self._closed:
+            self._write([(collection_name, operation)])
+            return
+        try:
+            self._queue.put_nowait((collection_name, operation))
+        except queue.Full:
+            print("Database write queue full, writing synchronously")
+            self._write([(collection_name, operation)])
+
+    def flush(self):
+        """Block until every queued operation has been written."""
+        self._queue.join()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        # Indexes are created here so a slow or unreachable server never
+        # blocks the request that first touched the database.
+        try:
+            ensure_indexes(self.db)
+        except Exception as e:
+            print(f"Error creating database indexes: {e}")
+
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                break
+
+            batch = [item]
+            deadline = time.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0, deadline - time.time()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    self._queue.task_done()
+                    break
+                batch.append(item)
+
+            self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write(self, batch):
+        by_collection = {}
+        for collection_name, operation in batch:
+            by_collection.setdefault(collection_name, []).append(operation)
+        for collection_name, operations in by_collection.items():
+            try:
+                # Ordered, so repeated writes to one document keep their order.
+                self.db[collection_name].bulk_write(operations, ordered=True)
+            except Exception as e:
+                self.failures += 1
+                print(f"Error writing {len(operations)} operations to {collection_name}: {e}")
+
+_write_queue = None
+_write_queue_lock = threading.Lock()
+
+def get_write_queue(db):
+    global _write_queue
+    if _write_queue is None:
+        with _write_queue_lock:
+            if _write_queue is None:
+                _write_queue = WriteBehindQueue(db)
+    return _write_queue
 
 class DatabaseManager:
-    def __init__(self):
+    """Stores the latest research per company in `research`, plus every run as
+    a snapshot.
+
+    A snapshot (`research_snapshots`) maps each section name to the hash of
+    its content; the content lives once per hash in `research_sections`. A
+    run that only changes the news therefore stores one new section and a
+    small snapshot document.
+    """
+
+    # company name -> {section: hash} last written by this process, so unchanged
+    # sections are not re-sent at all. Shared by every manager in the process.
+    _last_hashes = OrderedDict()
+    _last_hashes_lock = threading.Lock()
+    _write_failures_seen = 0
+
+    def __init__(self, write_behind=DB_WRITE_BEHIND):
         try:
-            self.client = pymongo.MongoClient(MONGO_URI)
+            self.client = get_mongo_client()
             self.db = self.client[MONGO_DB]
             self.companies = self.db.companies
             self.research = self.db.research
@@ -18,8 +163,19 @@ class DatabaseManager:
             self.companies = None
             self.research = None
             self.connected = False
+
+        self.write_queue = None
+        if self.connected:
+            if write_behind:
+                self.write_queue = get_write_queue(self.db)
+            else:
+                try:
+                    ensure_indexes(self.db)
+                except Exception as e:
+                    print(f"Error creating database indexes: {e}")
     
-    def save_research(self, company_research):
+    def save_research(self, company_research, partial=False):
+        """Save a research result; `partial` marks a result holding only some sections."""
         if not self.connected:
             print("Database not connected. Cannot save research.")
             return False
@@ -28,26 +184,97 @@ class DatabaseManager:
             # Add timestamp
             company_research['timestamp'] = datetime.now()
             
-            # Insert or update
-            result = self.research.update_one(
+            # Insert or update. Section timestamps are set field by field so a
+            # partial (sections=...) result does not wipe the others.
+            update = {key: value for key, value in company_research.items() if key != 'section_timestamps'}
+            for section, stored_at in (company_research.get('section_timestamps') or {}).items():
+                update[f"section_timestamps.{section}"] = stored_at
+            operation = pymongo.UpdateOne(
                 {"company_name": company_research.get('company_name')},
-                {"$set": company_research},
+                {"$set": update},
                 upsert=True
             )
             
+            self._write("research", [operation])
+            self._save_snapshot(company_research, partial)
+            
             return True
         except Exception as e:
             print(f"Error saving research: {e}")
             return False
     
-    def get_research(self, company_name):
+    def _save_snapshot(self, company_research, partial=False):
+        company_name = company_research.get('company_name')
+        hashes = {}
+        new_sections = []
+        for section, data in company_research.items():
+            if section in SNAPSHOT_META_KEYS:
+                continue
+            hashes[section] = section_hash(data)
+            new_sections.append((section, hashes[section], data))
+        
+        with self._last_hashes_lock:
+            failures = self.write_queue.failures if self.write_queue else 0
+            if failures != DatabaseManager._write_failures_seen:
+                # Some queued write was lost, so the map may name sections that
+                # were never stored: send everything again once.
+                self._last_hashes.clear()
+                DatabaseManager._write_failures_seen = failures
+            previous = self._last_hashes.get(company_name, {})
+        
+        # Content-addressed: $setOnInsert leaves an existing section untouched.
+        section_operations = [
+            pymongo.UpdateOne(
+                {"_id": digest},
+                {"$setOnInsert": {"section": section, "data": data, "created_at": company_research['timestamp']}},
+                upsert=True
+            )
+            for section, digest, data in new_sections if previous.get(section) != digest
+        ]
+        if section_operations:
+            self._write("research_sections", section_operations)
+        self._write("research_snapshots", [pymongo.InsertOne({
+            "company_name": company_name,
+            "timestamp": company_research['timestamp'],
+            "sections": hashes,
+            "partial": partial
+        })])
+        
+        with self._last_hashes_lock:
+            self._last_hashes.pop(company_name, None)
+            self._last_hashes[company_name] = hashes
+            while len(self._last_hashes) > SNAPSHOT_HASH_CACHE_SIZE:
+                self._last_hashes.popitem(last=False)
+    
+    def _write(self, collection_name, operations):
+        if self.write_queue:
+            for operation in operations:
+                self.write_queue.put(collection_name, operation)
+        else:
+            self.db[collection_name].bulk_write(operations, ordered=True)
+    
+    def flush(self):
+        """Wait for queued writes, e.g. before reading back something just saved."""
+        if self.write_queue:
+            self.write_queue.flush()
+    
+    def get_research(self, company_name, sections=None):
+        """Latest stored research; with `sections`, only those fields are read from Mongo."""
         if not self.connected:
             print("Database not connected. Cannot retrieve research.")
             return None
         
+        projection = None
+        if sections:
+            projection = {"_id": 0, "company_name": 1, "timestamp": 1}
+            for section in sections:
+                projection[section] = 1
+                projection[f"section_timestamps.{section}"] = 1
+        
         try:
             result = self.research.find_one(
                 {"company_name": company_name},
+                projection,
                 sort=[("timestamp", pymongo.DESCENDING)]
             )
             
@@ -60,4 +287,95 @@ class DatabaseManager:
             return None
         except Exception as e:
             print(f"Error retrieving research: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    def list_research_versions(self, company_name, since=None, until=None, limit=0):
+        """Snapshot metadata (timestamp and section hashes), newest first.
+
+        Runs restricted to some sections produce snapshots holding only those.
+        """
+        if not self.connected:
+            print("Database not connected. Cannot retrieve research history.")
+            return []
+        
+        try:
+            query = {"company_name": company_name}
+            if since or until:
+                query["timestamp"] = {}
+                if since:
+                    query["timestamp"]["$gte"] = since
+                if until:
+                    query["timestamp"]["$lte"] = until
+            cursor = self.db.research_snapshots.find(
+                query, {"_id": 0}, sort=[("timestamp", pymongo.DESCENDING)], limit=limit
+            )
+            return list(cursor)
+        except Exception as e:
+            print(f"Error retrieving research history: {e}")
+            return []
+    
+    def get_research_version(self, company_name, as_of=None):
+        """Rebuild the research as it was at `as_of` (the latest snapshot when None).
+
+        Each section comes from the newest snapshot at or before `as_of` that
+        contains it: the walk back stops at the first complete snapshot.
+        """
+        if not self.connected:
+            print("Database not connected. Cannot retrieve research history.")
+            return None
+        
+        query = {"company_name": company_name}
+        if as_of:
+            query["timestamp"] = {"$lte": as_of}
+        
+        hashes = {}
+        latest = None
+        try:
+            for snapshot in self.db.research_snapshots.find(query, {"_id": 0}, sort=[("timestamp", pymongo.DESCENDING)]):
+                latest = latest or snapshot
+                for section, digest in snapshot["sections"].items():
+                    hashes.setdefault(section, digest)
+                if not snapshot.get("partial"):
+                    break
+        except Exception as e:
+            print(f"Error retrieving research history: {e}")
+            return None
+        if latest is None:
+            return None
+        
+        sections = self._load_sections(hashes.values())
+        result = {"company_name": latest["company_name"], "timestamp": latest["timestamp"]}
+        for section, digest in hashes.items():
+            # A section still in the write queue reads as missing rather than failing the rebuild.
+            result[section] = sections.get(digest)
+        return result
+    
+    def get_section_history(self, company_name, section, since=None, until=None):
+        """[{timestamp, data}] for one section across snapshots, oldest first.
+
+        Consecutive snapshots with identical content are collapsed into one entry.
+        """
+        history = []
+        versions = self.list_research_versions(company_name, since=since, until=until)
+        versions = [version for version in reversed(versions) if section in version["sections"]]
+        sections = self._load_sections(version["sections"][section] for version in versions)
+        
+        last_digest = None
+        for version in versions:
+            digest = version["sections"][section]
+            if digest == last_digest:
+                continue
+            last_digest = digest
+            history.append({"timestamp": version["timestamp"], "data": sections.get(digest)})
+        return history
+    
+    def _load_sections(self, digests):
+        digests = list(set(digests))
+        if not digests:
+            return {}
+        try:
+            cursor = self.db.research_sections.find({"_id": {"$in": digests}}, {"data": 1})
+            return {document["_id"]: document["data"] for document in cursor}
+        except Exception as e:
+            print(f"Error loading research sections: {e}")
+            return {}
@@ -0,0 +1,123 @@
+# storage/price_store.py
+import json
+import os
+import re
+import threading
+import numpy as np
+from config import PRICE_STORE_DIR
+
+# Each ticker gets a directory of raw little-endian column files. New bars are
+# plain file appends and reads are zero-copy memory maps. Files are never
+# truncated in place (that would break live maps); full rewrites go through a
+# temporary file and an atomic rename. A small meta.json next to the columns
+# records facts about the series itself, such as the exchange timezone.
+COLUMN_DTYPES = {
+    "timestamp": np.dtype("<i8"),
+    "open": np.dtype("<f4"),
+    "high": np.dtype("<f4"),
+    "low": np.dtype("<f4"),
+    "close": np.dtype("<f4"),
+    "volume": np.dtype("<i8"),
+}
+
+class PriceStore:
+    def __init__(self, root=PRICE_STORE_DIR):
+        self.root = root
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _ticker_dir(self, ticker_symbol):
+        return os.path.join(self.root, re.sub(r"[^A-Z0-9._-]", "_", ticker_symbol.upper()))
+
+    def _column_path(self, ticker_symbol, column):
+        return os.path.join(self._ticker_dir(ticker_symbol), f"{column}.bin")
+
+    def _ticker_lock(self, ticker_symbol):
+        with self._lock:
+            return self._locks.setdefault(ticker_symbol.upper(), threading.Lock())
+
+    def _lengths(self, ticker_symbol):
+        lengths = {}
+        for column, dtype in COLUMN_DTYPES.items():
+            path = self._column_path(ticker_symbol, column)
+            lengths[column] = os.path.getsize(path) // dtype.itemsize if os.path.exists(path) else 0
+        return lengths
+
+    def read(self, ticker_symbol):
+        # An interrupted append can leave some columns longer; trust the shortest.
+        length = min(self._lengths(ticker_symbol).values())
+        if length == 0:
+            return None
+
+        return {
+            column: np.memmap(self._column_path(ticker_symbol, column), dtype=dtype, mode="r", shape=(length,))
+            for column, dtype in COLUMN_DTYPES.items()
+        }
+
+    def append(self, ticker_symbol, columns):
+        """Append the bars newer than the last stored one; returns how many were written."""
+        with self._ticker_lock(ticker_symbol):
+            stored = self.read(ticker_symbol)
+            last = int(stored["timestamp"][-1]) if stored is not None else None
+
+            lengths = self._lengths(ticker_symbol)
+            if stored is not None and len(set(lengths.values())) > 1:
+                self._write(ticker_symbol, {column: np.array(values) for column, values in stored.items()})
+            del stored
+
+            timestamps = np.asarray(columns["timestamp"], dtype=COLUMN_DTYPES["timestamp"])
+            keep = timestamps > last if last is not None else np.ones(len(timestamps), dtype=bool)
+            if not keep.any():
+                return 0
+
+            os.makedirs(self._ticker_dir(ticker_symbol), exist_ok=True)
+            for column, dtype in COLUMN_DTYPES.items():
+                values = np.asarray(columns[column])[keep].astype(dtype)
+                with open(self._column_path(ticker_symbol, column), "ab") as f:
+                    f.write(values.tobytes())
+            return int(keep.sum())
+
+    def replace(self, ticker_symbol, columns):
+        with self._ticker_lock(ticker_symbol):
+            self._write(ticker_symbol, columns)
+            return len(columns["timestamp"])
+
+    def read_meta(self, ticker_symbol):
+        path = self._meta_path(ticker_symbol)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def write_meta(self, ticker_symbol, meta):
+        with self._ticker_lock(ticker_symbol):
+            os.makedirs(self._ticker_dir(ticker_symbol), exist_ok=True)
+            path = self._meta_path(ticker_symbol)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, path)
+
+    def _meta_path(self, ticker_symbol):
+        return os.path.join(self._ticker_dir(ticker_symbol), "meta.json")
+
+    def _write(self, ticker_symbol, columns):
+        os.makedirs(self._ticker_dir(ticker_symbol), exist_ok=True)
+        for column, dtype in COLUMN_DTYPES.items():
+            path = self._column_path(ticker_symbol, column)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(np.asarray(columns[column]).astype(dtype).tobytes())
+            os.replace(tmp_path, path)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_price_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = PriceStore()
+    return _store
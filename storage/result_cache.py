@@ -0,0 +1,125 @@
+# storage/result_cache.py
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from config import (RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_MAX_BYTES,
+                    RESULT_CACHE_TTL, RESULT_CACHE_STALE_TTL)
+
+class ResultCache:
+    """In-memory LRU cache for research results with a TTL and a byte budget.
+
+    An entry is fresh for `ttl` seconds and may then be served stale for another
+    `stale_ttl` seconds while a background refresh replaces it.
+    """
+
+    def __init__(self, max_entries=RESULT_CACHE_MAX_ENTRIES, max_bytes=RESULT_CACHE_MAX_BYTES,
+                 ttl=RESULT_CACHE_TTL, stale_ttl=RESULT_CACHE_STALE_TTL, refresh_workers=2):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._refresh_executor = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="cache-refresh")
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return (value, state) where state is 'fresh', 'stale' or 'miss'."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, "miss"
+
+            value, stored_at, _ = entry
+            age = time.time() - stored_at
+            if age >= self.ttl + self.stale_ttl:
+                self._remove(key)
+                self.misses += 1
+                return None, "miss"
+
+            self._entries.move_to_end(key)
+            if age < self.ttl:
+                self.hits += 1
+                return value, "fresh"
+            self.stale_hits += 1
+            return value, "stale"
+
+    def set(self, key, value):
+        size = len(json.dumps(value, default=str))
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, time.time(), size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def get_or_load(self, key, loader, cacheable=None):
+        """Serve from cache; stale values are returned at once and refreshed in the background.
+
+        Loaded values for which `cacheable(value)` is false are returned but not stored.
+        """
+        value, state = self.get(key)
+        if state == "fresh":
+            return value
+        if state == "stale":
+            self._schedule_refresh(key, loader, cacheable)
+            return value
+
+        value = loader()
+        if cacheable is None or cacheable(value):
+            self.set(key, value)
+        return value
+
+    def _schedule_refresh(self, key, loader, cacheable=None):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                value = loader()
+                if cacheable is None or cacheable(value):
+                    self.set(key, value)
+            except Exception as e:
+                print(f"Background refresh failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._refresh_executor.submit(refresh)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def invalidate(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "refreshing": len(self._refreshing),
+            }
@@ -0,0 +1,6 @@
+# tests/conftest.py
+import os
+import sys
+
+# Let `pytest` run from anywhere; the project modules live at the repo root.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,126 @@
+# tests/stubs.py
+import copy
+import io
+import pymongo
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.response import HTTPResponse
+
+class StubTransport(BaseAdapter):
+    """requests adapter that answers from `routes` instead of the network.
+
+    `routes(request)` returns `(status, body)` or `(status, body, headers)`.
+    Every request sent is recorded in `calls`.
+    """
+
+    def __init__(self, routes):
+        super().__init__()
+        self.routes = routes
+        self.calls = []
+
+    def send(self, request, stream=False, timeout=None, **kwargs):
+        self.calls.append(request)
+        status, body, *rest = self.routes(request)
+        headers = {"Content-Type": "text/html; charset=utf-8", **(rest[0] if rest else {})}
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+
+        response = requests.Response()
+        response.status_code = status
+        response.url = request.url
+        response.request = request
+        response.headers = CaseInsensitiveDict(headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = HTTPResponse(body=io.BytesIO(body), headers=headers, status=status,
+                                    preload_content=False, decode_content=False)
+        if not stream:
+            response.content
+        return response
+
+    def close(self):
+        pass
+
+
+class FakeCollection:
+    """In-memory stand-in for the slice of a pymongo collection storage/ uses.
+
+    Filters support equality plus $in, $gte and $lte. Every bulk_write is kept
+    in `writes` so tests can see what was sent.
+    """
+
+    def __init__(self):
+        self.documents = []
+        self.writes = []
+
+    def create_index(self, keys, **kwargs):
+        pass
+
+    def bulk_write(self, operations, ordered=True):
+        self.writes.append(list(operations))
+        for operation in operations:
+            if isinstance(operation, pymongo.InsertOne):
+                self.documents.append(copy.deepcopy(operation._doc))
+            else:
+                self._update(operation._filter, operation._doc, operation._upsert)
+
+    def find(self, query=None, projection=None, sort=None, limit=0):
+        found = [document for document in self.documents if _matches(document, query or {})]
+        for field, direction in reversed(sort or []):
+            found.sort(key=lambda document: document[field], reverse=direction < 0)
+        if limit:
+            found = found[:limit]
+        found = [copy.deepcopy(document) for document in found]
+        if projection and projection.get("_id") == 0:
+            for document in found:
+                document.pop("_id", None)
+        return found
+
+    def find_one(self, query=None, projection=None, sort=None):
+        found = self.find(query, projection, sort, limit=1)
+        return found[0] if found else None
+
+    def _update(self, query, update, upsert):
+        document = next((document for document in self.documents if _matches(document, query)), None)
+        if document is None:
+            if not upsert:
+                return
+            document = dict(query)
+            self.documents.append(document)
+            _apply_set(document, update.get("$setOnInsert", {}))
+        _apply_set(document, update.get("$set", {}))
+
+class FakeMongoDatabase:
+    def __init__(self):
+        self._collections = {}
+
+    def __getitem__(self, name):
+        return self._collections.setdefault(name, FakeCollection())
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+def _matches(document, query):
+    for field, condition in query.items():
+        value = document.get(field)
+        if isinstance(condition, dict):
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+            if "$gte" in condition and not value >= condition["$gte"]:
+                return False
+            if "$lte" in condition and not value <= condition["$lte"]:
+                return False
+        elif value != condition:
+            return False
+    return True
+
+def _apply_set(document, fields):
+    for path, value in fields.items():
+        target = document
+        *parents, name = path.split(".")
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[name] = copy.deepcopy(value)
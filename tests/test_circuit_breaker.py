@@ -0,0 +1,89 @@
+# tests/test_circuit_breaker.py
+import pytest
+from data_collectors import circuit_breaker
+from data_collectors.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry, CircuitOpenError
+from data_collectors.http_client import HttpClient
+from data_collectors.response_cache import ResponseCache
+from stubs import StubTransport
+
+URL = "https://example.com/page"
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    return now
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+def test_half_open_lets_one_probe_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+
+    clock[0] += 30
+    assert breaker.allow()
+    assert breaker.state == "half_open"
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow()
+
+def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30)
+    for _ in range(5):
+        breaker.record_failure()
+    clock[0] += 30
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    clock[0] += 29
+    assert not breaker.allow()
+
+def test_registry_keeps_one_breaker_per_host():
+    registry = CircuitBreakerRegistry(failure_threshold=1)
+    assert registry.get("a.com") is registry.get("a.com")
+    registry.get("a.com").record_failure()
+    registry.get("b.com")
+    assert registry.states() == {"a.com": "open", "b.com": "closed"}
+
+def test_client_skips_hosts_with_open_circuits(clock):
+    transport = StubTransport(lambda request: (503, "down"))
+    client = HttpClient(transport=transport, breakers=CircuitBreakerRegistry(failure_threshold=2), max_retries=0)
+
+    assert client.get(URL).status_code == 503
+    assert client.get(URL).status_code == 503
+    with pytest.raises(CircuitOpenError):
+        client.get(URL)
+    assert len(transport.calls) == 2
+
+def test_client_ignores_client_errors(clock):
+    transport = StubTransport(lambda request: (404, "missing"))
+    client = HttpClient(transport=transport, breakers=CircuitBreakerRegistry(failure_threshold=1))
+    client.get(URL)
+    client.get(URL)
+    assert len(transport.calls) == 2
+
+def test_client_serves_stale_cache_while_circuit_is_open(clock, tmp_path):
+    status = [200]
+    transport = StubTransport(lambda request: (status[0], "cached"))
+    cache = ResponseCache(directory=str(tmp_path), default_ttl=0, source_ttls={})
+    client = HttpClient(transport=transport, cache=cache, breakers=CircuitBreakerRegistry(failure_threshold=1))
+
+    assert client.get(URL).text == "cached"
+    status[0] = 500
+    assert client.get(URL).status_code == 500
+    assert client.get(URL).text == "cached"
+    assert len(transport.calls) == 2
@@ -0,0 +1,275 @@
+# tests/test_core.py
+import threading
+import time
+from datetime import datetime, timedelta
+import pytest
+from core import ResearchEngine, ResearchBusy, STAGE_DEPENDENCIES, SECTION_STAGES
+
+STAGE_SECONDS = 0.2
+
+class FakeDB:
+    def __init__(self, previous=None):
+        self.previous = previous
+        self.saved = []
+
+    def get_research(self, company_name, sections=None):
+        return self.previous
+
+    def save_research(self, research_results, partial=False):
+        self.saved.append(research_results)
+
+def make_engine(stage_seconds=None, **kwargs):
+    """Engine whose stages just sleep; `stage_seconds` overrides single stages."""
+    kwargs.setdefault("incremental", False)
+    engine = ResearchEngine(**kwargs)
+    engine._components["db"] = FakeDB()
+    engine.ran = []
+    durations = dict.fromkeys(STAGE_DEPENDENCIES, STAGE_SECONDS)
+    durations.update(stage_seconds or {})
+    for name, seconds in durations.items():
+        def stage(company_name, deps, name=name, seconds=seconds):
+            engine.ran.append(name)
+            time.sleep(seconds)
+            return {"stage": name}
+        engine.stages[name] = stage
+    return engine
+
+def run_concurrently(calls):
+    """Run each zero-argument callable on its own thread; returns (result, seconds) pairs."""
+    results = [None] * len(calls)
+    barrier = threading.Barrier(len(calls))
+
+    def run(i):
+        barrier.wait()
+        started = time.monotonic()
+        results[i] = (calls[i](), time.monotonic() - started)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(calls))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+    return results
+
+def test_sequential_engine_runs_every_stage():
+    engine = make_engine(dict.fromkeys(STAGE_DEPENDENCIES, 0), concurrent=False)
+    result = engine.research_company("Sequential Co", deadline=0)
+    assert set(result) == {"company_name", "section_timestamps"} | set(SECTION_STAGES)
+
+def test_concurrent_research_calls_do_not_queue_behind_each_other():
+    engine = make_engine(concurrent=True, max_workers=8)
+    calls = [lambda i=i: engine.research_company(f"Throughput Co {i}", deadline=0) for i in range(16)]
+
+    results = run_concurrently(calls)
+
+    # The critical path is two stages (ticker -> financials/trends, news -> sentiment).
+    # A shared 8-thread pool would need 16 * 8 stages / 8 threads = 16 stage times.
+    assert all(result["overview"] == {"stage": "overview"} for result, _ in results)
+    assert max(seconds for _, seconds in results) < 5 * STAGE_SECONDS
+
+def wait_until_idle(engine, companies, timeout=10):
+    from core import research_flights, research_key
+    keys = {research_key(company) for company in companies}
+    end = time.monotonic() + timeout
+    while keys & set(research_flights.in_flight()):
+        assert time.monotonic() < end, "background research did not finish"
+        time.sleep(0.05)
+
+def test_fast_sections_complete_while_a_slow_source_stalls():
+    engine = make_engine({"news": 1.5}, concurrent=True, max_workers=8, background_workers=10)
+    companies = [f"Deadline Co {i}" for i in range(10)]
+    calls = [lambda company=company: engine.research_company(company, deadline=0.8) for company in companies]
+
+    results = run_concurrently(calls)
+
+    for result, seconds in results:
+        assert seconds < 1.2
+        assert result["partial"] is True
+        assert result["section_status"].pop("recent_news") == "late"
+        assert set(result["section_status"].values()) == {"complete"}
+    wait_until_idle(engine, companies)
+
+def test_late_work_runs_once_per_key():
+    engine = make_engine({"news": 1}, concurrent=True)
+    slow_stage = engine.stages["news"]
+    runs = []
+
+    def counted(company_name, deps):
+        runs.append(company_name)
+        return slow_stage(company_name, deps)
+
+    engine.stages["news"] = counted
+    for _ in range(3):
+        result = engine.research_company("Late Co", deadline=0.1)
+        assert result["section_status"]["recent_news"] == "late"
+    wait_until_idle(engine, ["Late Co"])
+
+    assert runs == ["Late Co"]
+
+def test_background_runs_are_bounded():
+    engine = make_engine({"news": 1}, concurrent=True, background_workers=2)
+    companies = ["Busy Co 1", "Busy Co 2"]
+    for company in companies:
+        assert engine.research_company(company, deadline=0.1)["partial"] is True
+
+    # Both threads hold late work: a new company is refused, a running one is joined.
+    with pytest.raises(ResearchBusy):
+        engine.research_company("Busy Co 3", deadline=0.1)
+    assert engine.research_company("Busy Co 1", deadline=0.1)["partial"] is True
+
+    # Threads are handed back just after the flights end.
+    wait_until_idle(engine, companies)
+    end = time.monotonic() + 5
+    while True:
+        try:
+            result = engine.research_company("Busy Co 3", deadline=5)
+            break
+        except ResearchBusy:
+            assert time.monotonic() < end
+            time.sleep(0.01)
+    assert "partial" not in result
+
+class FakeCompanyInfo:
+    def __init__(self, canonical_names):
+        self.canonical_names = canonical_names
+
+    def get_company_overview(self, company_name):
+        name = self.canonical_names.get(company_name)
+        return {"company_name": name} if name else {}
+
+class FakeFinancialData:
+    SYMBOLS = {"apple": "AAPL", "apple inc.": "AAPL", "alphabet inc.": "GOOGL"}
+
+    def __init__(self):
+        self.lookups = []
+
+    def _get_ticker_symbol(self, company_name):
+        self.lookups.append(company_name)
+        return self.SYMBOLS.get(company_name.strip().lower())
+
+    def get_financial_data(self, company_name, ticker_symbol=None):
+        return {"ticker": ticker_symbol}
+
+class FakeTrends:
+    def get_growth_trend(self, ticker_symbol):
+        return {"ticker": ticker_symbol}
+
+    def forecast_trend(self, ticker_symbol):
+        return None
+
+def make_collector_engine(canonical_names):
+    engine = ResearchEngine(concurrent=True, incremental=False)
+    engine._components.update(
+        db=FakeDB(),
+        company_info=FakeCompanyInfo(canonical_names),
+        financial_data=FakeFinancialData(),
+        trends_analyzer=FakeTrends(),
+    )
+    return engine
+
+def test_trends_use_the_overviews_canonical_name():
+    engine = make_collector_engine({"Google": "Alphabet Inc."})
+    result = engine.research_company("Google", sections="financials,growth_trends", deadline=0)
+
+    # Financials resolve the requested name, trends the canonical one, as before.
+    assert result["financials"] == {"ticker": None}
+    assert result["growth_trends"] == {"ticker": "GOOGL"}
+    assert sorted(engine.financial_data.lookups) == ["Alphabet Inc.", "Google"]
+
+def test_ticker_is_resolved_once_when_names_agree():
+    engine = make_collector_engine({"apple inc.": "Apple Inc."})
+    result = engine.research_company("apple inc.", sections="financials,growth_trends", deadline=0)
+
+    assert result["growth_trends"] == {"ticker": "AAPL"}
+    assert engine.financial_data.lookups == ["apple inc."]
+
+def test_no_trends_without_an_overview_name():
+    engine = make_collector_engine({})
+    result = engine.research_company("apple", sections="growth_trends", deadline=0)
+    assert result["growth_trends"] is None
+
+TTLS = {section: 15 * 60 for section in SECTION_STAGES}
+
+def stored_research(ages):
+    """A stored result whose sections were saved `ages[section]` minutes ago."""
+    now = datetime.now()
+    previous = {"company_name": "Stored Co", "section_timestamps": {}}
+    for section in SECTION_STAGES:
+        previous[section] = {"stored": section}
+        previous["section_timestamps"][section] = now - timedelta(minutes=ages.get(section, 1))
+    return previous
+
+def make_incremental_engine(previous):
+    engine = make_engine(dict.fromkeys(STAGE_DEPENDENCIES, 0), incremental=True, section_ttls=TTLS)
+    engine._components["db"] = FakeDB(previous)
+    return engine
+
+def test_only_stale_sections_run_with_their_dependencies():
+    previous = stored_research({"financials": 20, "recent_news": 30})
+    engine = make_incremental_engine(previous)
+    progress = []
+
+    result = engine.research_company("Stored Co", deadline=0,
+                                     progress_callback=lambda stage, *args: progress.append(stage))
+
+    assert sorted(engine.ran) == ["financials", "news", "sentiment", "ticker"]
+    assert result["financials"] == {"stage": "financials"}
+    assert result["recent_news"] == {"stage": "sentiment"}
+    assert result["overview"] == {"stored": "overview"}
+    # Reused sections keep their stored timestamps and still show up in progress.
+    assert result["section_timestamps"]["overview"] == previous["section_timestamps"]["overview"]
+    assert result["section_timestamps"]["financials"] > previous["section_timestamps"]["financials"]
+    assert sorted(progress) == sorted(engine.ran + ["overview", "social", "competitors", "trends"])
+
+def test_nothing_runs_when_every_section_is_fresh():
+    engine = make_incremental_engine(stored_research({}))
+    result = engine.research_company("Stored Co", deadline=0)
+    assert engine.ran == []
+    assert result["competitors"] == {"stored": "competitors"}
+
+def test_empty_sections_are_never_reused():
+    previous = stored_research({})
+    previous["competitors"] = []
+    engine = make_incremental_engine(previous)
+    engine.research_company("Stored Co", deadline=0)
+    assert engine.ran == ["competitors"]
+
+def test_incremental_refresh_can_be_disabled():
+    engine = make_engine(dict.fromkeys(STAGE_DEPENDENCIES, 0), incremental=False, section_ttls=TTLS)
+    engine._components["db"] = FakeDB(stored_research({}))
+    engine.research_company("Stored Co", deadline=0)
+    assert sorted(engine.ran) == sorted(STAGE_DEPENDENCIES)
+
+def test_stale_trends_rerun_the_overview_and_ticker_they_need():
+    engine = make_incremental_engine(stored_research({"growth_trends": 20}))
+    result = engine.research_company("Stored Co", deadline=0)
+    assert sorted(engine.ran) == ["overview", "ticker", "trends"]
+    # The overview was only re-run as an input; the section itself is still reused.
+    assert result["overview"] == {"stored": "overview"}
+
+def test_stages_for_sections_adds_dependencies():
+    from core import stages_for_sections
+
+    # Trends need the overview's canonical name as well as the ticker.
+    assert stages_for_sections(["financials", "growth_trends"]) == ["overview", "ticker", "financials", "trends"]
+    assert stages_for_sections(["financials"]) == ["ticker", "financials"]
+    assert stages_for_sections(["recent_news"]) == ["news", "sentiment"]
+    assert stages_for_sections(list(SECTION_STAGES)) == list(STAGE_DEPENDENCIES)
+
+def test_normalize_sections_maps_aliases_in_section_order():
+    from core import normalize_sections
+
+    assert normalize_sections("trends, news,sentiment") == ["recent_news", "growth_trends"]
+    assert normalize_sections(["social", "overview"]) == ["overview", "social_media_sentiment"]
+    assert normalize_sections(None) == list(SECTION_STAGES)
+    assert normalize_sections(" , ") == list(SECTION_STAGES)
+    with pytest.raises(ValueError):
+        normalize_sections("financials,weather")
+
+def test_partial_run_only_runs_requested_stages():
+    engine = make_engine(dict.fromkeys(STAGE_DEPENDENCIES, 0))
+    result = engine.research_company("Partial Co", sections="financials", deadline=0)
+
+    assert sorted(engine.ran) == ["financials", "ticker"]
+    assert set(result) == {"company_name", "financials", "section_timestamps"}
+    assert engine.db.saved == [result]
@@ -0,0 +1,127 @@
+# tests/test_database.py
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import pytest
+from storage import database
+from storage.database import DatabaseManager, section_hash
+from stubs import FakeMongoDatabase
+
+class FakeClient:
+    def __init__(self, db):
+        self.db = db
+
+    def __getitem__(self, name):
+        return self.db
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = FakeMongoDatabase()
+    monkeypatch.setattr(database, "get_mongo_client", lambda: FakeClient(fake))
+    monkeypatch.setattr(DatabaseManager, "_last_hashes", OrderedDict())
+
+    # One second per save, so snapshots have distinct, predictable timestamps.
+    clock = [datetime(2024, 10, 18, 12, 0)]
+
+    class Clock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            clock[0] += timedelta(seconds=1)
+            return clock[0]
+
+    monkeypatch.setattr(database, "datetime", Clock)
+    return fake
+
+def research(news="news A", financials="fin A", company="Acme"):
+    return {"company_name": company, "recent_news": [news], "financials": {"price": financials}}
+
+def section_writes(db):
+    return [operation._filter["_id"] for batch in db.research_sections.writes for operation in batch]
+
+def test_identical_sections_are_stored_once(db):
+    DatabaseManager(write_behind=False).save_research(research(company="Acme"))
+    DatabaseManager._last_hashes.clear()
+    DatabaseManager(write_behind=False).save_research(research(company="Acme"))
+
+    stored = db.research_sections.find({})
+    assert sorted(document["_id"] for document in stored) == sorted(
+        [section_hash(["news A"]), section_hash({"price": "fin A"})])
+    # $setOnInsert kept the first copy.
+    assert all(document["created_at"] == datetime(2024, 10, 18, 12, 0, 1) for document in stored)
+
+def test_unchanged_sections_are_not_resent(db):
+    manager = DatabaseManager(write_behind=False)
+    manager.save_research(research(news="news A"))
+    manager.save_research(research(news="news B"))
+
+    assert section_writes(db) == [section_hash(["news A"]), section_hash({"price": "fin A"}),
+                                  section_hash(["news B"])]
+    assert len(db.research_snapshots.find({})) == 2
+
+def test_past_run_is_rebuilt(db):
+    manager = DatabaseManager(write_behind=False)
+    manager.save_research(research(financials="fin A"))
+    manager.save_research(research(financials="fin B"))
+    first, second = sorted(version["timestamp"] for version in manager.list_research_versions("Acme"))
+
+    past = manager.get_research_version("Acme", as_of=first)
+    assert past["timestamp"] == first
+    assert past["financials"] == {"price": "fin A"}
+    assert past["recent_news"] == ["news A"]
+    assert manager.get_research_version("Acme")["financials"] == {"price": "fin B"}
+    assert manager.get_research_version("Acme", as_of=first - timedelta(seconds=1)) is None
+
+def test_section_history_collapses_unchanged_runs(db):
+    manager = DatabaseManager(write_behind=False)
+    for news in ("news A", "news A", "news B", "news B", "news A"):
+        manager.save_research(research(news=news))
+    timestamps = sorted(version["timestamp"] for version in manager.list_research_versions("Acme"))
+
+    history = manager.get_section_history("Acme", "recent_news")
+    assert history == [
+        {"timestamp": timestamps[0], "data": ["news A"]},
+        {"timestamp": timestamps[2], "data": ["news B"]},
+        {"timestamp": timestamps[4], "data": ["news A"]},
+    ]
+    assert manager.get_section_history("Acme", "recent_news", since=timestamps[1], until=timestamps[3]) == [
+        {"timestamp": timestamps[1], "data": ["news A"]},
+        {"timestamp": timestamps[2], "data": ["news B"]},
+    ]
+
+def test_lost_queued_write_resends_every_section(db):
+    class FailedQueue:
+        failures = 0
+
+        def put(self, collection_name, operation):
+            db[collection_name].bulk_write([operation])
+
+    manager = DatabaseManager(write_behind=False)
+    manager.write_queue = FailedQueue()
+    manager.save_research(research())
+    manager.write_queue.failures = 1
+    manager.save_research(research())
+
+    assert len(section_writes(db)) == 4
+
+def test_partial_snapshots_are_merged_with_the_last_full_one(db):
+    manager = DatabaseManager(write_behind=False)
+    manager.save_research(research(news="news A", financials="fin A"))
+    manager.save_research({"company_name": "Acme", "recent_news": ["news B"]}, partial=True)
+    manager.save_research({"company_name": "Acme", "financials": {"price": "fin C"}}, partial=True)
+    first, second, third = sorted(version["timestamp"] for version in manager.list_research_versions("Acme"))
+
+    latest = manager.get_research_version("Acme")
+    assert latest["timestamp"] == third
+    assert latest["recent_news"] == ["news B"]
+    assert latest["financials"] == {"price": "fin C"}
+
+    as_of_second = manager.get_research_version("Acme", as_of=second)
+    assert as_of_second["recent_news"] == ["news B"]
+    assert as_of_second["financials"] == {"price": "fin A"}
+
+def test_merge_stops_at_the_newest_full_snapshot(db):
+    manager = DatabaseManager(write_behind=False)
+    manager.save_research({"company_name": "Acme", "competitors": ["Old"], **research()})
+    manager.save_research(research(news="news B"))
+
+    # The newer full run has no competitors section; the older one is not consulted.
+    assert "competitors" not in manager.get_research_version("Acme")
@@ -0,0 +1,35 @@
+# tests/test_financial_data.py
+from data_collectors.financial_data import FinancialDataCollector
+
+class RecordingCollector(FinancialDataCollector):
+    def __init__(self):
+        super().__init__()
+        self.alpha_vantage_key = None
+        self.lookups = []
+        self.quotes = []
+
+    def _get_ticker_symbol(self, company_name):
+        self.lookups.append(company_name)
+        return "ACME"
+
+    def _get_yahoo_finance_data(self, ticker_symbol):
+        self.quotes.append(ticker_symbol)
+        return {"stock_price": "$1.00"}
+
+def test_resolves_the_ticker_when_none_is_given():
+    collector = RecordingCollector()
+    assert collector.get_financial_data("Acme")["stock_price"] == "$1.00"
+    assert collector.lookups == ["Acme"]
+
+def test_uses_a_given_ticker():
+    collector = RecordingCollector()
+    collector.get_financial_data("Acme", ticker_symbol="ACME")
+    assert collector.lookups == []
+    assert collector.quotes == ["ACME"]
+
+def test_does_not_retry_a_failed_resolution():
+    collector = RecordingCollector()
+    result = collector.get_financial_data("Acme", ticker_symbol=None)
+    assert collector.lookups == []
+    assert collector.quotes == []
+    assert result["stock_price"] is None
@@ -0,0 +1,83 @@
+# tests/test_http_client.py
+import pytest
+import requests
+from data_collectors import http_client
+from data_collectors.circuit_breaker import CircuitBreakerRegistry
+from data_collectors.http_client import HttpClient
+from stubs import StubTransport
+
+URL = "https://example.com/page"
+
+class CountingLimiter:
+    def __init__(self):
+        self.acquired = []
+
+    def acquire(self, url_or_host, max_wait=None):
+        self.acquired.append(url_or_host)
+        return 0
+
+@pytest.fixture
+def slept(monkeypatch):
+    slept = []
+    monkeypatch.setattr(http_client.time, "sleep", slept.append)
+    return slept
+
+def replies(*responses):
+    """Routes answering each request with the next of `responses`; an exception is raised."""
+    remaining = list(responses)
+
+    def routes(request):
+        response = remaining.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+    return routes
+
+def test_server_errors_are_retried_with_backoff(slept):
+    transport = StubTransport(replies((503, "busy"), (503, "busy"), (200, "ok")))
+    client = HttpClient(transport=transport, max_retries=2, backoff_factor=0.5)
+
+    assert client.get(URL).text == "ok"
+    assert slept == [0.5, 1.0]
+
+def test_connection_errors_are_retried(slept):
+    transport = StubTransport(replies(requests.exceptions.ConnectionError("reset"), (200, "ok")))
+    client = HttpClient(transport=transport, max_retries=1, backoff_factor=0.5)
+
+    assert client.get(URL).text == "ok"
+    assert slept == [0.5]
+
+def test_retry_after_is_honoured_up_to_the_cap(slept):
+    transport = StubTransport(replies((429, "", {"Retry-After": "2"}), (200, "ok")))
+    client = HttpClient(transport=transport, max_retries=1, backoff_factor=0.5, retry_max_wait=5)
+
+    assert client.get(URL).text == "ok"
+    assert slept == [2.0]
+
+def test_long_retry_after_is_returned_instead_of_waited_out(slept):
+    transport = StubTransport(replies((503, "", {"Retry-After": "3600"}), (200, "ok")))
+    client = HttpClient(transport=transport, max_retries=2, retry_max_wait=5)
+
+    response = client.get(URL)
+    assert response.status_code == 503
+    assert slept == []
+    assert len(transport.calls) == 1
+
+def test_posts_are_not_retried(slept):
+    transport = StubTransport(replies((503, "busy"), (200, "ok")))
+    client = HttpClient(transport=transport, max_retries=2)
+
+    assert client.post(URL).status_code == 503
+    assert len(transport.calls) == 1
+
+def test_every_attempt_spends_a_token_and_counts_in_the_breaker(slept):
+    transport = StubTransport(lambda request: (503, "down"))
+    limiter = CountingLimiter()
+    breakers = CircuitBreakerRegistry(failure_threshold=2)
+    client = HttpClient(transport=transport, rate_limiter=limiter, breakers=breakers, max_retries=5)
+
+    # The second failure opens the circuit, which ends the retries.
+    assert client.get(URL).status_code == 503
+    assert len(transport.calls) == 2
+    assert len(limiter.acquired) == 2
+    assert breakers.states() == {"example.com": "open"}
@@ -0,0 +1,34 @@
+# tests/test_keyword_sentiment.py
+from analysis.keyword_sentiment import KeywordSentimentScorer
+
+TEXT = "Growth was strong, profit up; but layoffs and a lawsuit hurt. Déjà vu: growth again, ungrowth no."
+
+def make_scorer():
+    return KeywordSentimentScorer(["growth", "profit", "strong"], ["layoffs", "lawsuit", "déjà"])
+
+def test_count_matches_whole_words_case_insensitively():
+    assert make_scorer().count(TEXT) == (4, 3)
+
+def test_count_stream_matches_count_for_every_str_split():
+    scorer = make_scorer()
+    expected = scorer.count(TEXT)
+    for i in range(len(TEXT) + 1):
+        for j in range(i, len(TEXT) + 1, 7):
+            assert scorer.count_stream([TEXT[:i], TEXT[i:j], TEXT[j:]]) == expected
+
+def test_count_stream_decodes_bytes_split_inside_a_character():
+    scorer = make_scorer()
+    data = TEXT.encode("utf-8")
+    expected = scorer.count(TEXT)
+    for i in range(len(data) + 1):
+        assert scorer.count_stream([data[:i], data[i:]]) == expected
+
+def test_count_stream_does_not_match_inside_long_words():
+    scorer = make_scorer()
+    assert scorer.count_stream(["xxxxxxxxxxxxgrow", "th"]) == (0, 0)
+    assert scorer.count_stream(["xxxxxxxxxxxx", "growth"]) == (0, 0)
+
+def test_label():
+    assert KeywordSentimentScorer.label(3, 1) == "Positive"
+    assert KeywordSentimentScorer.label(1, 3) == "Negative"
+    assert KeywordSentimentScorer.label(2, 2) == "Neutral"
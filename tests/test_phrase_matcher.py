@@ -0,0 +1,29 @@
+# tests/test_phrase_matcher.py
+from analysis.phrase_matcher import PhraseMatcher, tokenize
+
+PHRASES = {"growth": 1, "strong growth": 2, "not strong": -2, "layoffs": -1, "record": 1}
+
+def test_tokenize_keeps_hyphens_and_apostrophes():
+    assert tokenize("Year-over-year GROWTH, company's record!") == ["year-over-year", "growth", "company's", "record"]
+
+def test_finds_overlapping_phrases():
+    matcher = PhraseMatcher(PHRASES)
+    found = sorted(matcher.find("Sales were not strong growth"))
+    assert found == [("growth", 1), ("not strong", -2), ("strong growth", 2)]
+    assert matcher.score("Sales were not strong growth") == 1
+
+def test_matches_whole_tokens_only():
+    matcher = PhraseMatcher(PHRASES)
+    assert matcher.find("regrowth and recorded layoffsville") == []
+
+def test_counts_repeated_occurrences():
+    matcher = PhraseMatcher(PHRASES)
+    assert matcher.score("record record layoffs") == 1
+
+def test_failure_links_recover_partial_matches():
+    matcher = PhraseMatcher({"a b c": 1, "b d": 1})
+    assert matcher.find("a b d") == [("b d", 1)]
+
+def test_len_counts_phrases():
+    assert len(PhraseMatcher(PHRASES)) == len(PHRASES)
+    assert len(PhraseMatcher({})) == 0
@@ -0,0 +1,105 @@
+# tests/test_rate_limiter.py
+import pytest
+from data_collectors import rate_limiter
+from data_collectors.http_client import HttpClient
+from data_collectors.rate_limiter import TokenBucket, HostRateLimiter, RateLimitExceeded
+from stubs import StubTransport
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(rate_limiter.time, "sleep", sleep)
+    return now, slept
+
+def test_burst_is_served_without_waiting(clock):
+    bucket = TokenBucket(rate=2, capacity=3)
+    assert [bucket.acquire() for _ in range(3)] == [0, 0, 0]
+
+def test_callers_past_the_burst_wait_in_turn(clock):
+    now, slept = clock
+    bucket = TokenBucket(rate=2, capacity=1)
+    bucket.acquire()
+    assert bucket.acquire() == pytest.approx(0.5)
+    assert slept == [pytest.approx(0.5)]
+
+def test_tokens_refill_up_to_capacity(clock):
+    now, _ = clock
+    bucket = TokenBucket(rate=1, capacity=2)
+    bucket.acquire()
+    bucket.acquire()
+    now[0] += 60
+    assert [bucket.acquire() for _ in range(2)] == [0, 0]
+    assert bucket.acquire() == pytest.approx(1)
+
+def test_max_wait_fails_fast_without_adding_debt(clock):
+    _, slept = clock
+    bucket = TokenBucket(rate=1, capacity=1)
+    bucket.acquire()
+    for _ in range(10):
+        with pytest.raises(RateLimitExceeded) as error:
+            bucket.acquire(max_wait=0.5)
+        assert error.value.retry_after == pytest.approx(1)
+    assert slept == []
+    assert bucket.acquire(max_wait=1) == pytest.approx(1)
+
+def test_host_limiter_matches_subdomains(clock):
+    limiter = HostRateLimiter({"finance.yahoo.com": (1, 1)}, max_wait=0)
+    limiter.acquire("https://query1.finance.yahoo.com/v8/finance/chart/AAPL")
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire("finance.yahoo.com")
+    assert limiter.acquire("https://example.com/") == 0
+
+def test_client_answers_429_when_the_wait_is_too_long(clock):
+    transport = StubTransport(lambda request: (200, "ok"))
+    limiter = HostRateLimiter({"example.com": (1, 1)}, max_wait=0.5)
+    client = HttpClient(transport=transport, rate_limiter=limiter)
+
+    assert client.get("https://example.com/a").status_code == 200
+    response = client.get("https://example.com/b")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+    assert len(transport.calls) == 1
+
+def test_open_circuit_fails_fast_without_spending_tokens(clock):
+    from data_collectors.circuit_breaker import CircuitBreakerRegistry, CircuitOpenError
+
+    _, slept = clock
+    transport = StubTransport(lambda request: (503, "down"))
+    limiter = HostRateLimiter({"example.com": (1, 1)}, max_wait=5)
+    breakers = CircuitBreakerRegistry(failure_threshold=1, reset_timeout=60)
+    client = HttpClient(transport=transport, rate_limiter=limiter, breakers=breakers)
+
+    assert client.get("https://example.com/a").status_code == 503
+    for _ in range(5):
+        with pytest.raises(CircuitOpenError):
+            client.get("https://example.com/a")
+    assert slept == []
+
+    # Only the first request spent a token.
+    assert limiter.acquire("example.com") == pytest.approx(1)
+
+def test_rate_limited_probe_gives_its_slot_back(clock, monkeypatch):
+    from data_collectors import circuit_breaker
+    from data_collectors.circuit_breaker import CircuitBreakerRegistry
+
+    now, _ = clock
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    transport = StubTransport(lambda request: (200, "ok"))
+    limiter = HostRateLimiter({"example.com": (1, 1)}, max_wait=0)
+    breakers = CircuitBreakerRegistry(failure_threshold=1, reset_timeout=60)
+    breakers.get("example.com").record_failure()
+    client = HttpClient(transport=transport, rate_limiter=limiter, breakers=breakers)
+
+    now[0] += 60
+    limiter.acquire("example.com")
+    assert client.get("https://example.com/a").status_code == 429
+    now[0] += 1
+    assert client.get("https://example.com/a").status_code == 200
+    assert breakers.states() == {"example.com": "closed"}
@@ -0,0 +1,105 @@
+# tests/test_response_cache.py
+import json
+import os
+import pytest
+from data_collectors.http_client import HttpClient
+from data_collectors.response_cache import ResponseCache
+from stubs import StubTransport
+
+URL = "https://example.com/page"
+
+def make_client(tmp_path, routes, **cache_kwargs):
+    cache_kwargs.setdefault("source_ttls", {})
+    cache = ResponseCache(directory=str(tmp_path), **cache_kwargs)
+    transport = StubTransport(routes)
+    return HttpClient(transport=transport, cache=cache), transport
+
+def test_fresh_entry_is_served_without_a_request(tmp_path):
+    client, transport = make_client(tmp_path, lambda request: (200, "hello"), default_ttl=600)
+
+    assert client.get(URL).text == "hello"
+    assert client.get(URL).text == "hello"
+    assert len(transport.calls) == 1
+
+def test_stale_entry_is_revalidated_with_304(tmp_path):
+    def routes(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return 304, ""
+        return 200, "hello", {"ETag": '"v1"'}
+
+    client, transport = make_client(tmp_path, routes, default_ttl=0)
+    assert client.get(URL).text == "hello"
+
+    response = client.get(URL)
+    assert response.status_code == 200
+    assert response.text == "hello"
+    assert len(transport.calls) == 2
+    assert transport.calls[1].headers["If-None-Match"] == '"v1"'
+
+def test_offline_miss_returns_504(tmp_path):
+    client, transport = make_client(tmp_path, lambda request: (200, "hello"), offline=True)
+
+    assert client.get(URL).status_code == 504
+    assert transport.calls == []
+
+def test_offline_serves_stale_entries(tmp_path):
+    client, _ = make_client(tmp_path, lambda request: (200, "hello"), default_ttl=0)
+    client.get(URL)
+
+    offline, transport = make_client(tmp_path, lambda request: (200, "changed"), default_ttl=0, offline=True)
+    assert offline.get(URL).text == "hello"
+    assert transport.calls == []
+
+def test_least_recently_used_entries_are_evicted_past_max_bytes(tmp_path):
+    client, transport = make_client(tmp_path, lambda request: (200, request.url[-6:]), max_bytes=10)
+
+    client.get("https://example.com/first1")
+    client.get("https://example.com/second")
+    assert client.cache._total_bytes <= 10
+
+    client.get("https://example.com/second")
+    assert len(transport.calls) == 2
+    client.get("https://example.com/first1")
+    assert len(transport.calls) == 3
+
+def test_partially_read_stream_is_not_cached(tmp_path):
+    client, transport = make_client(tmp_path, lambda request: (200, "x" * 1000))
+
+    response = client.get(URL, stream=True)
+    next(response.iter_content(100))
+    response.close()
+
+    assert client.cache.get(client.cache.key(URL)) is None
+    assert os.listdir(os.path.join(str(tmp_path), "tmp")) == []
+    assert client.get(URL).text == "x" * 1000
+    assert len(transport.calls) == 2
+
+def test_credentials_are_not_written_to_disk(tmp_path):
+    client, transport = make_client(tmp_path, lambda request: (200, "news"))
+
+    client.get("https://newsapi.org/v2/everything", params={"q": "Tesla", "apiKey": "SECRET1"})
+    client.get("https://newsapi.org/v2/everything", params={"q": "Tesla", "apiKey": "SECRET2"})
+    assert len(transport.calls) == 1
+
+    entries_dir = os.path.join(str(tmp_path), "entries")
+    for name in os.listdir(entries_dir):
+        with open(os.path.join(entries_dir, name)) as f:
+            assert "SECRET" not in f.read()
+
+@pytest.mark.parametrize("param", ["apiKey", "user_key"])
+def test_entries_holding_credentials_are_dropped_on_load(tmp_path, param):
+    client, _ = make_client(tmp_path, lambda request: (200, "body"))
+    client.get(URL)
+
+    entries_dir = os.path.join(str(tmp_path), "entries")
+    (name,) = os.listdir(entries_dir)
+    path = os.path.join(entries_dir, name)
+    with open(path) as f:
+        entry = json.load(f)
+    entry["url"] = f"{URL}?{param}=SECRET"
+    with open(path, "w") as f:
+        json.dump(entry, f)
+
+    cache = ResponseCache(directory=str(tmp_path), source_ttls={})
+    assert cache.get(name[:-5]) is None
+    assert not os.path.exists(path)
@@ -0,0 +1,50 @@
+# tests/test_routes.py
+import pytest
+from flask import Flask
+from api import routes
+
+class RecordingEngine:
+    def __init__(self):
+        self.calls = []
+
+    def research_company(self, company_name, sections=None, deadline=None, progress_callback=None):
+        self.calls.append((company_name, sections))
+        return {"company_name": company_name}
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = RecordingEngine()
+    monkeypatch.setattr(routes, "get_research_engine", lambda: engine)
+    return engine
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(routes.api_blueprint, url_prefix="/api")
+    return app.test_client()
+
+@pytest.mark.parametrize("param", ["sections", "fields"])
+def test_research_passes_requested_sections(client, engine, param):
+    response = client.get(f"/api/research?company=Acme&{param}=trends,news")
+    assert response.status_code == 200
+    assert engine.calls == [("Acme", ["recent_news", "growth_trends"])]
+
+def test_research_defaults_to_every_section(client, engine):
+    client.get("/api/research?company=Acme")
+    assert engine.calls == [("Acme", list(routes.normalize_sections(None)))]
+
+def test_unknown_section_is_a_400(client, engine):
+    response = client.get("/api/research?company=Acme&fields=financials,weather")
+    assert response.status_code == 400
+    assert "weather" in response.get_json()["error"]
+    assert engine.calls == []
+
+def test_unknown_section_in_a_job_is_a_400(client, monkeypatch):
+    submitted = []
+    monkeypatch.setattr(routes.research_jobs, "submit", lambda *args, **kwargs: submitted.append(args))
+    response = client.post("/api/research/jobs", json={"company": "Acme", "sections": "weather"})
+    assert response.status_code == 400
+    assert submitted == []
+
+def test_stream_rejects_unknown_sections(client):
+    assert client.get("/api/research/stream?company=Acme&sections=weather").status_code == 400
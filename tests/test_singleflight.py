@@ -0,0 +1,143 @@
+# tests/test_singleflight.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from singleflight import SingleFlight
+
+def test_concurrent_callers_share_one_call():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fn(emit):
+        calls.append(1)
+        emit("started")
+        started.set()
+        release.wait(5)
+        return "result"
+
+    # Every caller hears "started" once it is subscribed, joiners through the replay.
+    subscribed = threading.Semaphore(0)
+    results = []
+    def call():
+        results.append(flights.do("key", fn, lambda *args: subscribed.release()))
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    assert started.wait(5)
+    joiners = [threading.Thread(target=call) for _ in range(4)]
+    for thread in joiners:
+        thread.start()
+    for _ in range(5):
+        assert subscribed.acquire(timeout=5)
+    release.set()
+    for thread in [leader] + joiners:
+        thread.join(5)
+        assert not thread.is_alive()
+
+    assert calls == [1]
+    assert sorted(results) == [("result", False)] + [("result", True)] * 4
+    assert flights.in_flight() == []
+
+def test_different_keys_run_separately():
+    flights = SingleFlight()
+    assert flights.do("a", lambda emit: 1) == (1, False)
+    assert flights.do("b", lambda emit: 2) == (2, False)
+
+def test_key_is_released_after_an_error():
+    flights = SingleFlight()
+
+    def fail(emit):
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flights.do("key", fail)
+    assert flights.in_flight() == []
+    assert flights.do("key", lambda emit: "ok") == ("ok", False)
+
+def test_late_listener_replays_earlier_events():
+    flights = SingleFlight()
+    emitted = threading.Event()
+    release = threading.Event()
+
+    def fn(emit):
+        emit("search", 1)
+        emitted.set()
+        release.wait(5)
+        emit("financials", 2)
+        return "done"
+
+    leader = threading.Thread(target=flights.do, args=("key", fn))
+    leader.start()
+    assert emitted.wait(5)
+
+    events = []
+    replayed = threading.Event()
+
+    def listener(*args):
+        events.append(args)
+        replayed.set()
+
+    joiner = threading.Thread(target=flights.do, args=("key", fn, listener))
+    joiner.start()
+    assert replayed.wait(5)
+    release.set()
+    for thread in (leader, joiner):
+        thread.join(5)
+        assert not thread.is_alive()
+
+    assert events == [("search", 1), ("financials", 2)]
+
+def test_failing_listener_does_not_break_the_flight():
+    flights = SingleFlight()
+
+    def listener(*args):
+        raise RuntimeError("listener")
+
+    def fn(emit):
+        emit("stage")
+        return "ok"
+
+    assert flights.do("key", fn, listener) == ("ok", False)
+
+def test_start_returns_at_once_and_runs_once_per_key():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fn(emit):
+        calls.append(1)
+        release.wait(5)
+        return "result"
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    first, first_shared = flights.start("key", fn, executor)
+    second, second_shared = flights.start("key", fn, executor)
+    assert (first_shared, second_shared) == (False, True)
+    assert second is first
+    assert not first.done()
+
+    release.set()
+    assert first.result(5) == "result"
+    assert calls == [1]
+
+def test_start_delivers_errors_through_the_future():
+    flights = SingleFlight()
+
+    def fail(emit):
+        raise ValueError("boom")
+
+    future, _ = flights.start("key", fail, ThreadPoolExecutor(max_workers=1))
+    with pytest.raises(ValueError):
+        future.result(5)
+
+def test_start_drops_the_flight_when_the_executor_refuses():
+    class Refusing:
+        def submit(self, fn, *args):
+            raise RuntimeError("full")
+
+    flights = SingleFlight()
+    with pytest.raises(RuntimeError):
+        flights.start("key", lambda emit: "never", Refusing())
+    assert flights.in_flight() == []
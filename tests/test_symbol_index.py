@@ -0,0 +1,42 @@
+# tests/test_symbol_index.py
+import pytest
+from config import SYMBOL_LISTING_PATH
+from data_collectors.symbol_index import SymbolIndex, normalize_company_name, strip_legal_suffixes
+
+@pytest.fixture(scope="module")
+def index():
+    return SymbolIndex(SYMBOL_LISTING_PATH)
+
+@pytest.mark.parametrize("name, symbol", [
+    ("Apple", "AAPL"),
+    ("Apple Inc.", "AAPL"),
+    ("Microsoft Corporation", "MSFT"),
+    ("Amazon.com", "AMZN"),
+    ("Nvidia Corp", "NVDA"),
+    ("aapl", "AAPL"),
+])
+def test_exact_and_suffix_lookup(index, name, symbol):
+    assert index.lookup(name) == symbol
+
+def test_fuzzy_lookup_accepts_close_match_with_same_first_token(index):
+    assert index.lookup("Alphabet Incc") == "GOOGL"
+
+@pytest.mark.parametrize("name", ["Applebee's", "Intelsat", "Intel Capital", "Microsoftt"])
+def test_near_miss_names_fall_through(index, name):
+    assert index.lookup(name) is None
+
+def test_ambiguous_match_is_rejected():
+    index = SymbolIndex()
+    index.add("Acme Widgets", "AW")
+    index.add("Acme Widget", "AWX")
+    assert index.lookup("Acme Widgetz") is None
+
+def test_added_names_are_found():
+    index = SymbolIndex()
+    index.add("Initech Holdings", "INTK")
+    assert index.lookup("initech") == "INTK"
+    assert index.lookup("Initech Holdings Inc") == "INTK"
+
+def test_normalization():
+    assert normalize_company_name("  The Coca-Cola Co. ") == "the coca cola co"
+    assert strip_legal_suffixes("the coca cola co") == "coca cola"
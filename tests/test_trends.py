@@ -0,0 +1,97 @@
+# tests/test_trends.py
+import time
+import numpy as np
+import pandas as pd
+import pytest
+from analysis.trends import PriceHistoryProvider, TrendsAnalyzer
+from storage.price_store import PriceStore
+
+def synthetic_history(first_day, days, seed=0, tz="America/New_York"):
+    # Daily bars stamped at the exchange's local midnight, like yfinance.
+    index = pd.date_range(first_day, periods=days, freq="D", tz=tz)
+    closes = 100 * np.cumprod(1 + np.random.default_rng(seed).normal(0, 0.01, days))
+    return pd.DataFrame({
+        "Open": closes, "High": closes * 1.01, "Low": closes * 0.99,
+        "Close": closes, "Volume": np.full(days, 1000, dtype=np.int64),
+    }, index=index)
+
+class FakeProvider(PriceHistoryProvider):
+    def __init__(self, history, store):
+        super().__init__(ttl=0, store=store)
+        self.history = history
+        self.calls = []
+
+    def _fetch_history(self, ticker_symbol, **kwargs):
+        self.calls.append(kwargs)
+        tz = self.history.index.tz
+        if "start" in kwargs:
+            return self.history[self.history.index >= pd.Timestamp(kwargs["start"], tz=tz)]
+        if kwargs.get("period", "max") != "max":
+            today = pd.Timestamp(time.time(), unit="s", tz="UTC").tz_convert(tz).normalize()
+            return self.history[self.history.index >= today - pd.DateOffset(years=1)]
+        return self.history
+
+# Late in the day, with a leap day inside the year: the span is 366 days and the
+# first bar (04:00 UTC, midnight in New York) is earlier in the day than "now".
+NOW = pd.Timestamp("2024-10-18 18:00", tz="UTC")
+
+@pytest.fixture
+def history(monkeypatch):
+    monkeypatch.setattr(time, "time", lambda: NOW.timestamp())
+    # What a '1y' fetch returns: from the same calendar day one year ago up to today.
+    today = NOW.normalize()
+    first_day = today - pd.DateOffset(years=1)
+    return synthetic_history(first_day.tz_localize(None), (today - first_day).days + 1)
+
+def test_growth_matches_single_fetch(tmp_path, history):
+    provider = FakeProvider(history, PriceStore(str(tmp_path)))
+    trend = TrendsAnalyzer(price_history=provider).get_growth_trend("TEST")
+
+    closes = history["Close"].astype(np.float32).astype(np.float64)
+    expected = (closes.iloc[-1] - closes.iloc[0]) / closes.iloc[0] * 100
+    assert trend["start_date"] == history.index[0].strftime("%Y-%m-%d")
+    assert trend["growth_percentage"] == pytest.approx(round(expected, 2), abs=0.01)
+
+def test_incremental_update_keeps_first_calendar_day(tmp_path, history):
+    store = PriceStore(str(tmp_path))
+    FakeProvider(history, store).get_arrays("TEST")
+
+    provider = FakeProvider(history, store)
+    columns = provider.get_arrays("TEST")
+    assert "start" in provider.calls[0]
+    assert int(columns["timestamp"][0]) == int(history.index[0].timestamp())
+
+# 18:00 in Tokyo, where bars start at 15:00 UTC the day before.
+TOKYO_NOW = pd.Timestamp("2024-10-18 18:00", tz="Asia/Tokyo")
+
+@pytest.fixture
+def tokyo_history(monkeypatch):
+    monkeypatch.setattr(time, "time", lambda: TOKYO_NOW.timestamp())
+    return synthetic_history("2023-10-18", 367, tz="Asia/Tokyo")
+
+def test_dates_are_exchange_calendar_days(tmp_path, tokyo_history):
+    store = PriceStore(str(tmp_path))
+    trend = TrendsAnalyzer(price_history=FakeProvider(tokyo_history, store)).get_growth_trend("7203.T")
+    assert (trend["start_date"], trend["end_date"]) == ("2023-10-18", "2024-10-18")
+
+    # Served incrementally from the store on the next call.
+    provider = FakeProvider(tokyo_history, store)
+    trend = TrendsAnalyzer(price_history=provider).get_growth_trend("7203.T")
+    assert "start" in provider.calls[0]
+    assert (trend["start_date"], trend["end_date"]) == ("2023-10-18", "2024-10-18")
+    assert str(provider.get_history("7203.T").index.tz) == "Asia/Tokyo"
+
+def test_max_refetches_history_stored_from_a_shorter_period(tmp_path, monkeypatch):
+    monkeypatch.setattr(time, "time", lambda: NOW.timestamp())
+    history = synthetic_history("2020-01-02", (NOW.normalize().tz_localize(None) - pd.Timestamp("2020-01-02")).days + 1)
+    store = PriceStore(str(tmp_path))
+    FakeProvider(history, store).get_arrays("TEST", "1y")
+
+    provider = FakeProvider(history, store)
+    columns = provider.get_arrays("TEST", "max")
+    assert provider.calls == [{"period": "max"}]
+    assert int(columns["timestamp"][0]) == int(history.index[0].timestamp())
+
+    provider = FakeProvider(history, store)
+    provider.get_arrays("TEST", "max")
+    assert "start" in provider.calls[0] and len(provider.calls) == 1